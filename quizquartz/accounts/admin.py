@@ -1,10 +1,12 @@
 from django.contrib import admin
+from quizquartz.admin_utils import ScalableAdminMixin
 from .models import User
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("username", "email", "is_staff", "is_active", "id")
     search_fields = ("username",)
+    exact_search_fields = ("username", "email")
     readonly_fields = ("id",)
     ordering = ("username",)
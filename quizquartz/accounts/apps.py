@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.conf import settings
+        from django.contrib.auth.signals import user_logged_in
+
+        if not settings.LOGIN_UPDATE_LAST_LOGIN:
+            user_logged_in.disconnect(dispatch_uid="update_last_login")
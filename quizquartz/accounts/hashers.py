@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+import base64
+import hashlib
+
+
+# Each hasher keeps the algorithm name of its parent, so existing hashes still
+# verify. When a work factor setting changes, must_update() reports stored
+# hashes with the old parameters and Django rehashes them on the next login.
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 hasher with PASSWORD_PBKDF2_ITERATIONS iterations."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt hasher with a work factor of PASSWORD_SCRYPT_WORK_FACTOR."""
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            # Scrypt needs about 128 * n * r bytes; leave room for twice that.
+            # From the n being used, as verifying a hash made before the work
+            # factor was lowered needs more than the configured one.
+            maxmem=256 * n * r,
+            dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode("ascii").strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash_)
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 hasher with costs from the PASSWORD_ARGON2_* settings."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from accounts.views import LoginAPIView
+from importlib.util import find_spec
+from math import log2
+from time import perf_counter
+from uuid import uuid4
+
+
+User = get_user_model()
+
+# The work factor each hasher is swept over: its setting and label.
+WORK_FACTORS = {
+    "pbkdf2": ("PASSWORD_PBKDF2_ITERATIONS", "iterations"),
+    "scrypt": ("PASSWORD_SCRYPT_WORK_FACTOR", "n"),
+    "argon2": ("PASSWORD_ARGON2_TIME_COST", "time_cost"),
+}
+
+# Multiples of the configured work factor measured by default.
+DEFAULT_SCALES = [0.25, 0.5, 1, 2]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure logins per second on one core through LoginAPIView for each "
+        "password hasher at several work factors: PBKDF2 iterations, scrypt n "
+        "and Argon2 time_cost. By default, a quarter, half, once and twice the "
+        "configured one (marked with *). The test users are rolled back "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hashers",
+            nargs="+",
+            default=list(settings.CONFIGURABLE_PASSWORD_HASHERS),
+            choices=list(settings.CONFIGURABLE_PASSWORD_HASHERS),
+        )
+        parser.add_argument(
+            "--duration", type=float, default=5.0, help="Seconds per work factor."
+        )
+        for name, (_, label) in WORK_FACTORS.items():
+            parser.add_argument(
+                f"--{name}-{label.replace('_', '-')}",
+                dest=f"{name}_work_factors",
+                type=int,
+                nargs="+",
+                metavar=label.upper(),
+                help=f"Values of the {name} {label} to measure.",
+            )
+
+    def handle(self, *args, **options):
+        # Throttling would cap the measurement at the login rate.
+        view = LoginAPIView.as_view(throttle_classes=[])
+
+        for name in options["hashers"]:
+            if name == "argon2" and find_spec("argon2") is None:
+                self.stdout.write(f"{name:8} skipped (argon2-cffi not installed)")
+                continue
+
+            setting, label = WORK_FACTORS[name]
+            configured = getattr(settings, setting)
+            hashers = settings.CONFIGURABLE_PASSWORD_HASHERS
+            for work_factor in options[f"{name}_work_factors"] or (
+                self.get_default_work_factors(name, configured)
+            ):
+                with override_settings(
+                    PASSWORD_HASHERS=[hashers[name]]
+                    + [path for key, path in hashers.items() if key != name],
+                    **{setting: work_factor},
+                ):
+                    logins, elapsed = self.measure(view, options["duration"])
+
+                mark = "*" if work_factor == configured else " "
+                self.stdout.write(
+                    f"{name:8} {label + '=' + str(work_factor) + mark:20} "
+                    f"{logins / elapsed:8.2f} logins/sec "
+                    f"({elapsed / logins * 1000:.1f} ms/login)"
+                )
+
+    def get_default_work_factors(self, name, configured):
+        work_factors = []
+        for scale in DEFAULT_SCALES:
+            if name == "scrypt":
+                # n must stay a power of 2.
+                work_factor = 1 << max(
+                    1, round(configured.bit_length() - 1 + log2(scale))
+                )
+            else:
+                work_factor = max(1, round(configured * scale))
+            if work_factor not in work_factors:
+                work_factors.append(work_factor)
+        return work_factors
+
+    def measure(self, view, duration):
+        factory = APIRequestFactory()
+        password = f"Bench-{uuid4().hex}1!"
+
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=f"benchmark_{uuid4().hex[:8]}",
+                email=f"benchmark_{uuid4().hex[:8]}@example.com",
+                password=password,
+                nickname=f"benchmark_{uuid4().hex[:8]}",
+            )
+
+            logins = 0
+            started = perf_counter()
+            while perf_counter() - started < duration or logins == 0:
+                request = factory.post(
+                    "/auth-api/login/",
+                    {"username": user.username, "password": password},
+                    format="json",
+                )
+                SessionMiddleware(lambda request: None).process_request(request)
+                response = view(request)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Login failed: {response.data}")
+                logins += 1
+            elapsed = perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        return logins, elapsed
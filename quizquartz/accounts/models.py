@@ -1,11 +1,15 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Cast, Concat
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from rest_framework.authtoken.models import Token
 from uuid import uuid4
 
 
@@ -71,6 +75,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     objects = UserManager()
 
@@ -79,3 +84,28 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.username
+
+    def soft_delete(self):
+        """Hide the user and everything they created, without deleting rows.
+
+        The rows are removed later in batches by the purge_deleted command.
+        The unique fields are released right away so they can be reused.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            self.quizzes.update(deleted_at=now)
+            # Frees the unique titles like QuizGroup.soft_delete does.
+            self.quiz_groups.update(
+                title=Concat(
+                    Value("deleted-"), Cast("id", output_field=models.CharField())
+                ),
+                deleted_at=now,
+            )
+            Token.objects.filter(user=self).delete()
+            self.username = f"deleted-{self.pk.hex}"
+            self.email = f"{self.pk.hex}@deleted.invalid"
+            self.nickname = f"deleted-{self.pk.hex[:22]}"
+            self.set_unusable_password()
+            self.is_active = False
+            self.deleted_at = now
+            self.save()
@@ -1,13 +1,14 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
+from quizquartz.metrics import registry
+from quizquartz.uniqueness import UniqueFieldsMixin
 import re
 
-
 User = get_user_model()
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(UniqueFieldsMixin, serializers.ModelSerializer):
     """Serializer for user registration."""
 
     username = serializers.CharField(
@@ -34,27 +35,29 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ("username", "email", "password", "password2")
         extra_kwargs = {"password": {"write_only": True}}
 
+    unique_error_messages = {
+        "username": "**{value}**このユーザー名は既に使用されています。",
+        "email": "**{value}**このメールアドレスは既に使用されています。",
+    }
+
     def validate(self, data):
         username = data.get("username")
         email = data.get("email")
         password = data.get("password")
         password2 = data.get("password2")
+        taken_fields = self.get_taken_fields(data)
 
         # Username uniqueness check
-        if User.objects.filter(username=username).exists():
-            raise serializers.ValidationError(
-                detail=f"**{username}**このユーザー名は既に使用されています。"
-            )
+        if "username" in taken_fields:
+            raise self.unique_error("username", username)
         # Username format check
         if not re.match(pattern=r"^[\w.@+-]+$", string=username):
             raise serializers.ValidationError(
                 detail=f"**{username}**このユーザー名は無効です。"
             )
         # Email uniqueness check
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError(
-                detail=f"**{email}**このメールアドレスは既に使用されています。"
-            )
+        if "email" in taken_fields:
+            raise self.unique_error("email", email)
         # Password match check
         if password != password2:
             raise serializers.ValidationError(detail="パスワードが一致しません。")
@@ -84,7 +87,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop("password2")
-        user = User.objects.create_user(**validated_data)
+        user = self.save_unique(lambda: User.objects.create_user(**validated_data))
         return user
 
 
@@ -107,11 +110,18 @@ class LoginSerializer(serializers.Serializer):
                 password=password,
             )
             if not user:
+                registry.inc(
+                    "quizquartz_login_failures_total",
+                    (("reason", "invalid_credentials"),),
+                )
                 raise serializers.ValidationError(
                     detail="ログインに失敗しました。ユーザー名またはパスワードが正しくありません。",
                     code="authorization",
                 )
         else:
+            registry.inc(
+                "quizquartz_login_failures_total", (("reason", "missing_credentials"),)
+            )
             raise serializers.ValidationError(
                 detail="ユーザー名とパスワードの両方を入力してください。",
                 code="authorization",
@@ -131,7 +141,7 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ("username", "email", "nickname", "date_joined")
 
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(UniqueFieldsMixin, serializers.ModelSerializer):
     """Serializer for editing user details."""
 
     username = serializers.CharField(max_length=150)
@@ -142,33 +152,33 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         model = User
         fields = ("username", "email", "nickname")
 
+    unique_error_messages = {
+        "username": "**{value}**このユーザー名は既に使用されています。",
+        "email": "**{value}**このメールアドレスは既に使用されています。",
+        "nickname": "**{value}**このニックネームは既に使用されています。",
+    }
+
     def validate(self, data):
-        user_id = self.instance.id if self.instance else None
         username = data.get("username")
         email = data.get("email")
         nickname = data.get("nickname")
 
         if username and email and nickname:
+            taken_fields = self.get_taken_fields(data)
             # Username uniqueness check
-            if User.objects.exclude(id=user_id).filter(username=username).exists():
-                raise serializers.ValidationError(
-                    detail=f"**{username}**このユーザー名は既に使用されています。"
-                )
+            if "username" in taken_fields:
+                raise self.unique_error("username", username)
             # Username format check
             if not re.match(pattern=r"^[\w.@+-]+$", string=username):
                 raise serializers.ValidationError(
                     detail=f"**{username}**このユーザー名は無効です。"
                 )
             # Email uniqueness check
-            if User.objects.exclude(id=user_id).filter(email=email).exists():
-                raise serializers.ValidationError(
-                    detail=f"**{email}**このメールアドレスは既に使用されています。"
-                )
+            if "email" in taken_fields:
+                raise self.unique_error("email", email)
             # Nickname uniqueness check
-            if User.objects.exclude(id=user_id).filter(nickname=nickname).exists():
-                raise serializers.ValidationError(
-                    detail=f"**{nickname}**このニックネームは既に使用されています。"
-                )
+            if "nickname" in taken_fields:
+                raise self.unique_error("nickname", nickname)
         else:
             raise serializers.ValidationError(
                 detail="全てのフィールドを入力してください。"
@@ -180,7 +190,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         instance.username = validated_data.get("username", instance.username)
         instance.email = validated_data.get("email", instance.email)
         instance.nickname = validated_data.get("nickname", instance.nickname)
-        instance.save()
+        self.save_unique(instance.save)
         return instance
 
 
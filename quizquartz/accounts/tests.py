@@ -1,3 +1,16 @@
-from django.test import TestCase
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+SCRYPT_HASHERS = ["accounts.hashers.ConfigurableScryptPasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT_HASHERS)
+class ConfigurableScryptPasswordHasherTests(TestCase):
+    def test_verify_after_lowering_work_factor(self):
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2**15):
+            encoded = make_password("password")
+
+        rehashed = []
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2**14):
+            self.assertTrue(check_password("password", encoded, rehashed.append))
+        self.assertEqual(len(rehashed), 1)
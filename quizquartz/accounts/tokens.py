@@ -0,0 +1,52 @@
+from django.db import connection
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+
+UPSERT_CLAUSES = {
+    "sqlite": "ON CONFLICT ({user}) DO UPDATE SET {key} = excluded.{key}, "
+    "{created} = excluded.{created}",
+    "postgresql": "ON CONFLICT ({user}) DO UPDATE SET {key} = EXCLUDED.{key}, "
+    "{created} = EXCLUDED.{created}",
+    "mysql": "ON DUPLICATE KEY UPDATE {key} = VALUES({key}), "
+    "{created} = VALUES({created})",
+}
+
+
+def rotate_token(user):
+    """Replace the user's auth token with a new one and return its key.
+
+    Issued as a single INSERT ... ON CONFLICT upsert on the user's unique
+    column instead of a delete followed by a create. Token.key is the primary
+    key, which the ORM's bulk_create(update_conflicts=True) refuses to update,
+    hence the raw SQL. Other backends fall back to update-then-create.
+    """
+    key = Token.generate_key()
+    created = timezone.now()
+    clause = UPSERT_CLAUSES.get(connection.vendor)
+
+    if clause is None:
+        if not Token.objects.filter(user=user).update(key=key, created=created):
+            Token.objects.create(key=key, user=user, created=created)
+        return key
+
+    opts = Token._meta
+    quote = connection.ops.quote_name
+    columns = {
+        "key": quote(opts.get_field("key").column),
+        "user": quote(opts.get_field("user").column),
+        "created": quote(opts.get_field("created").column),
+    }
+    sql = (
+        "INSERT INTO {table} ({key}, {user}, {created}) VALUES (%s, %s, %s) "
+        + clause
+    ).format(table=quote(opts.db_table), **columns)
+    params = [
+        key,
+        opts.get_field("user").get_db_prep_value(user.pk, connection),
+        connection.ops.adapt_datetimefield_value(created),
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+    return key
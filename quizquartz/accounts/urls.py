@@ -7,17 +7,24 @@ from .views import (
     PasswordChangeAPIView,
     LogoutAPIView,
     UserDeleteAPIView,
+    run_in_hashing_pool,
 )
 
 
 urlpatterns = [
     # Any user can access.
-    path(route="registration/", view=UserRegistrationAPIView.as_view()),
-    path(route="login/", view=LoginAPIView.as_view()),
+    path(
+        route="registration/",
+        view=run_in_hashing_pool(UserRegistrationAPIView.as_view()),
+    ),
+    path(route="login/", view=run_in_hashing_pool(LoginAPIView.as_view())),
     # Authenticated users only can access.
     path(route="detail/", view=UserDetailAPIView.as_view()),
     path(route="update/", view=UserUpdateAPIView.as_view()),
-    path(route="password-change/", view=PasswordChangeAPIView.as_view()),
+    path(
+        route="password-change/",
+        view=run_in_hashing_pool(PasswordChangeAPIView.as_view()),
+    ),
     path(route="logout/", view=LogoutAPIView.as_view()),
     path(route="delete/", view=UserDeleteAPIView.as_view()),
 ]
@@ -1,9 +1,15 @@
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+from django.views.decorators.csrf import csrf_exempt
+from functools import lru_cache
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import login
+from django.contrib.auth.signals import user_logged_in
 from .serializers import (
     UserRegistrationSerializer,
     LoginSerializer,
@@ -11,12 +17,55 @@ from .serializers import (
     UserUpdateSerializer,
     PasswordChangeSerializer,
 )
+from .tokens import rotate_token
+
+
+@lru_cache(maxsize=None)
+def get_hashing_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_THREADS,
+        thread_name_prefix="password-hashing",
+    )
+
+
+def run_in_hashing_pool(view):
+    """Run a password hashing view in a bounded pool of its own threads.
+
+    A hash keeps a core (and, with scrypt or Argon2, a lot of memory) busy for
+    the whole login, and a burst of logins would otherwise hash all at once on
+    the threads serving every other request. Wrapping the view in an async one
+    that awaits the pool bounds the number of concurrent hashes to
+    PASSWORD_HASHING_THREADS, without blocking the event loop; further logins
+    wait for a free thread. Returns the view unchanged when
+    PASSWORD_HASHING_THREADS is 0.
+    """
+    if not settings.PASSWORD_HASHING_THREADS:
+        return view
+
+    def call_view(request, *args, **kwargs):
+        # Pool threads live outside the request cycle, so manage connections here.
+        close_old_connections()
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            close_old_connections()
+
+    async_view = sync_to_async(
+        call_view, thread_sensitive=False, executor=get_hashing_executor()
+    )
+
+    @csrf_exempt
+    async def pooled_view(request, *args, **kwargs):
+        return await async_view(request, *args, **kwargs)
+
+    return pooled_view
 
 
 class UserRegistrationAPIView(generics.CreateAPIView):
     """User registration view."""
 
     serializer_class = UserRegistrationSerializer
+    throttle_scope = "registration"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -37,18 +86,24 @@ class UserRegistrationAPIView(generics.CreateAPIView):
 class LoginAPIView(APIView):
     """User login view."""
 
+    throttle_scope = "login"
+
     def post(self, request, *args, **kwargs):
         serializer = LoginSerializer(data=request.data, context={"request": request})
 
         if serializer.is_valid(raise_exception=True):
             user = serializer.validated_data["user"]
-            login(request, user)
-            Token.objects.filter(user=user).delete()  # Delete old token
-            token = Token.objects.create(user=user)
+            if settings.LOGIN_CREATE_SESSION:
+                login(request, user)
+            else:
+                # Same as login() minus the session write; last_login is
+                # still updated unless LOGIN_UPDATE_LAST_LOGIN is off.
+                user_logged_in.send(sender=user.__class__, request=request, user=user)
+            token_key = rotate_token(user)  # Replaces the old token
             return Response(
                 data={
                     "message": "ログインに成功しました。",
-                    "token": token.key,
+                    "token": token_key,
                     "user": UserSerializer(user).data,
                 },
                 status=status.HTTP_200_OK,
@@ -84,6 +139,7 @@ class UserUpdateAPIView(generics.UpdateAPIView):
 
     serializer_class = UserUpdateSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def get_object(self):
         # Always return the authenticated user
@@ -112,6 +168,7 @@ class PasswordChangeAPIView(generics.UpdateAPIView):
 
     serializer_class = PasswordChangeSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def get_object(self):
         # Always return the authenticated user
@@ -149,11 +206,16 @@ class UserDeleteAPIView(generics.DestroyAPIView):
     """User delete view."""
 
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def get_object(self):
         # Always return the authenticated user
         return self.request.user
 
+    def perform_destroy(self, instance):
+        # Purged later in batches by the purge_deleted command.
+        instance.soft_delete()
+
     def delete(self, request, *args, **kwargs):
         instance = self.get_object()
         self.perform_destroy(instance)
@@ -0,0 +1,96 @@
+"""ModelAdmin helpers for tables with millions of rows."""
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.utils.functional import cached_property
+from uuid import UUID
+
+ESTIMATE_QUERIES = {
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+    "mysql": (
+        "SELECT table_rows FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = %s"
+    ),
+    # Only present once ANALYZE has run.
+    "sqlite": "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+}
+
+
+def estimate_row_count(model, using="default"):
+    """Return the planner's estimate of the model's row count, or None."""
+    connection = connections[using]
+    sql = ESTIMATE_QUERIES.get(connection.vendor)
+    if sql is None:
+        return None
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(sql, [model._meta.db_table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None or row[0] is None:
+        return None
+    # sqlite_stat1 holds "<rows> <rows per key>...".
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator using the planner's row estimate instead of COUNT(*).
+
+    The estimate is only used above ``estimate_threshold`` rows, where an
+    exact count costs a full scan and page numbers need not be exact.
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_row_count(self.object_list.model, self.object_list.db)
+        if estimate is None or estimate < self.estimate_threshold:
+            return super().count
+        return estimate
+
+
+class ScalableAdminMixin:
+    """ModelAdmin defaults for large tables.
+
+    - Unfiltered changelists are paginated on an estimated count, and the
+      "N total" count of filtered ones is skipped.
+    - A search term that is a UUID is looked up by primary key. A term
+      matching one of ``exact_search_fields`` exactly returns those rows.
+      Both go through unique or foreign key indexes. Only other terms fall
+      back to ``search_fields`` and their LIKE scans.
+    """
+
+    show_full_result_count = False
+    exact_search_fields = ()
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0, allow_empty_first_page=True
+    ):
+        # Only page and ordering parameters: the whole table is listed.
+        if set(request.GET) <= {"p", "o"}:
+            paginator_class = EstimatedCountPaginator
+        else:
+            paginator_class = Paginator
+        return paginator_class(queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return super().get_search_results(request, queryset, search_term)
+
+        try:
+            pk = UUID(term)
+        except ValueError:
+            pass
+        else:
+            return queryset.filter(pk=pk), False
+
+        for field in self.exact_search_fields:
+            matches = queryset.filter(**{field: term})
+            if matches.exists():
+                return matches, False
+
+        return super().get_search_results(request, queryset, search_term)
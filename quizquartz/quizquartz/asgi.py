@@ -2,6 +2,7 @@
 ASGI config for quizquartz project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django and WebSockets to the rooms (see ``rooms.consumers``).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -10,7 +11,21 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quizquartz.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Import the URLconf and the views now instead of on the first request (see
+# wsgi.py).
+get_resolver().url_patterns
+
+# Imported once Django is set up, as it loads models.
+from rooms.consumers import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
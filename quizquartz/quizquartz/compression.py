@@ -0,0 +1,131 @@
+"""Content encodings available to CompressionMiddleware.
+
+gzip is always available. zstd and brotli are used when the ``zstandard`` and
+``brotli`` packages are installed.
+"""
+
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional.
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional.
+    zstandard = None
+
+
+class GzipEncoding:
+    name = "gzip"
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=6, mtime=0)
+
+    def compress_stream(self, chunks):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+    async def acompress_stream(self, chunks):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class BrotliEncoding:
+    name = "br"
+
+    def compress(self, data):
+        return brotli.compress(data, quality=5)
+
+    def compress_stream(self, chunks):
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+    async def acompress_stream(self, chunks):
+        compressor = brotli.Compressor(quality=5)
+        async for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+class ZstdEncoding:
+    name = "zstd"
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def compress_stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        yield compressor.flush()
+
+    async def acompress_stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        yield compressor.flush()
+
+
+# Server preference, best first.
+ENCODINGS = {
+    encoding.name: encoding
+    for encoding in (
+        ZstdEncoding() if zstandard is not None else None,
+        BrotliEncoding() if brotli is not None else None,
+        GzipEncoding(),
+    )
+    if encoding is not None
+}
+
+
+def parse_accept_encoding(header):
+    """Return a mapping of coding name to quality value."""
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate_encoding(header, available=None):
+    """Pick the best encoding accepted by the client, or None."""
+    if not header:
+        return None
+
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in available or ENCODINGS:
+        quality = qualities.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compress_variants(data):
+    """Compress data with every available encoding, for caching."""
+    return {name: encoding.compress(data) for name, encoding in ENCODINGS.items()}
@@ -0,0 +1,262 @@
+"""Prometheus metrics of the API, summed over the worker processes.
+
+Each process counts in memory, under one short lock per update, and writes
+its totals to its own file in ``METRICS_DIR`` every
+``METRICS_FLUSH_INTERVAL`` seconds. The endpoint mounted on the secret
+``METRICS_ROUTE`` adds up the files of every process, those of exited
+workers included so that counters never go back, in the Prometheus text
+format. Without ``METRICS_DIR``, it reports the process answering it.
+
+Cache hit ratios are computed from ``quizquartz_cache_requests_total``, e.g.
+``sum by (cache) (rate(...{result="hit"}[5m])) / sum by (cache) (rate(...[5m]))``.
+"""
+
+from django.conf import settings
+from django.http import HttpResponse
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from time import monotonic, perf_counter, time_ns
+import atexit
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Other methods are counted as "other", to bound the number of samples.
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Name -> (type, help, histogram buckets).
+METRICS = {
+    "quizquartz_http_requests_total": (
+        "counter",
+        "HTTP requests by view, method and status code.",
+        None,
+    ),
+    "quizquartz_http_request_duration_seconds": (
+        "histogram",
+        "Time to respond to HTTP requests, by view.",
+        LATENCY_BUCKETS,
+    ),
+    "quizquartz_db_queries_total": (
+        "counter",
+        "Database queries run by HTTP requests, by view.",
+        None,
+    ),
+    "quizquartz_db_query_duration_seconds_total": (
+        "counter",
+        "Time spent in database queries by HTTP requests, by view.",
+        None,
+    ),
+    "quizquartz_cache_requests_total": (
+        "counter",
+        "Quiz API cache lookups by cache and result (hit or miss).",
+        None,
+    ),
+    "quizquartz_throttle_rejections_total": (
+        "counter",
+        "Requests rejected by a throttle, by throttle scope.",
+        None,
+    ),
+    "quizquartz_login_failures_total": (
+        "counter",
+        "Failed logins, by reason.",
+        None,
+    ),
+}
+
+
+class Registry:
+    """Counters and histograms of this process.
+
+    Samples are keyed by (metric name, labels), the labels being a tuple of
+    (name, value) pairs. A histogram sample holds a count per bucket (not
+    cumulative), then the sum and the count of the observations.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.values = defaultdict(float)
+        self.histograms = {}
+        self.flushed_at = monotonic()
+        # Unique per process, even when a PID is reused.
+        self.file_name = f"{os.getpid()}-{time_ns()}.json"
+
+    def inc(self, name, labels=(), amount=1):
+        with self.lock:
+            self.values[name, labels] += amount
+        self.maybe_flush()
+
+    def record_cache(self, cache, hits, misses):
+        with self.lock:
+            self.values[
+                "quizquartz_cache_requests_total", (("cache", cache), ("result", "hit"))
+            ] += hits
+            self.values[
+                "quizquartz_cache_requests_total",
+                (("cache", cache), ("result", "miss")),
+            ] += misses
+        self.maybe_flush()
+
+    def record_request(self, view, method, status, duration, queries, query_time):
+        """Record an HTTP request with one acquisition of the lock."""
+        labels = (("view", view),)
+        if method not in HTTP_METHODS:
+            method = "other"
+        with self.lock:
+            self.values[
+                "quizquartz_http_requests_total",
+                labels + (("method", method), ("status", str(status))),
+            ] += 1
+            self.values["quizquartz_db_queries_total", labels] += queries
+            self.values[
+                "quizquartz_db_query_duration_seconds_total", labels
+            ] += query_time
+            self.observe("quizquartz_http_request_duration_seconds", labels, duration)
+        self.maybe_flush()
+
+    def observe(self, name, labels, value):
+        # Called with the lock held.
+        buckets = METRICS[name][2]
+        sample = self.histograms.get((name, labels))
+        if sample is None:
+            sample = self.histograms[name, labels] = [0] * (len(buckets) + 3)
+        sample[bisect_left(buckets, value)] += 1
+        sample[-2] += value
+        sample[-1] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "values": [
+                    [name, labels, v] for (name, labels), v in self.values.items()
+                ],
+                "histograms": [
+                    [name, labels, list(sample)]
+                    for (name, labels), sample in self.histograms.items()
+                ],
+            }
+
+    def maybe_flush(self):
+        if (
+            settings.METRICS_DIR
+            and monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write this process's totals to its file in METRICS_DIR."""
+        if not settings.METRICS_DIR:
+            return
+        self.flushed_at = monotonic()
+        path = Path(settings.METRICS_DIR) / self.file_name
+        temporary_path = path.with_suffix(".tmp")
+        try:
+            temporary_path.write_text(json.dumps(self.snapshot()))
+            # Atomic, so readers never see a partial file.
+            os.replace(temporary_path, path)
+        except OSError:
+            logger.exception("Could not write the metrics to %s", path)
+
+
+class QueryCounter:
+    """Execute wrapper counting a request's queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - started
+
+
+registry = Registry()
+
+# Workers forked from a process that counted (e.g. with gunicorn --preload)
+# start from zero and write their own files.
+os.register_at_fork(after_in_child=registry.reset)
+atexit.register(registry.flush)
+
+
+def collect():
+    """Return the samples of every process, summed."""
+    snapshots = [registry.snapshot()]
+    if settings.METRICS_DIR:
+        registry.flush()
+        snapshots = []
+        for path in Path(settings.METRICS_DIR).glob("*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+
+    values = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["values"]:
+            values[name, tuple(map(tuple, labels))] += value
+        for name, labels, sample in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(sample))
+            for i, value in enumerate(sample):
+                total[i] += value
+    return values, histograms
+
+
+def escape(value):
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+
+def format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render():
+    values, histograms = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "histogram":
+            for (sample_name, labels), sample in sorted(histograms.items()):
+                if sample_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + ("+Inf",), sample):
+                    cumulative += count
+                    bucket_labels = labels + (("le", str(bound)),)
+                    lines.append(
+                        f"{name}_bucket{format_labels(bucket_labels)} {cumulative}"
+                    )
+                lines.append(
+                    f"{name}_sum{format_labels(labels)} {format_value(sample[-2])}"
+                )
+                lines.append(f"{name}_count{format_labels(labels)} {sample[-1]}")
+        else:
+            for (sample_name, labels), value in sorted(values.items()):
+                if sample_name == name:
+                    lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """Prometheus exposition endpoint, mounted on the secret METRICS_ROUTE."""
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from .compression import ENCODINGS, negotiate_encoding
+from .metrics import QueryCounter, registry
+from .slow_queries import SlowQueryRecorder, get_view_name
+from contextlib import ExitStack
+from time import perf_counter
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses with the best encoding the client accepts.
+
+    Only paths under ``COMPRESSION_PATH_PREFIXES`` are compressed, and only
+    bodies of at least ``COMPRESSION_MIN_SIZE`` bytes. Streaming responses are
+    compressed chunk by chunk with a flush after each chunk when
+    ``COMPRESSION_STREAMING`` is enabled, so nothing is held back. A response
+    carrying a ``precompressed`` mapping of encoding to body (see the quizzes
+    response cache) is served from it without compressing again.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if not request.path.startswith(tuple(settings.COMPRESSION_PATH_PREFIXES)):
+            return response
+        if response.streaming:
+            if not settings.COMPRESSION_STREAMING:
+                return response
+        elif len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        precompressed = getattr(response, "precompressed", None) or {}
+        name = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if name is None:
+            return response
+        encoding = ENCODINGS[name]
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = encoding.acompress_stream(
+                    response.streaming_content
+                )
+            else:
+                response.streaming_content = encoding.compress_stream(
+                    response.streaming_content
+                )
+            # The compressed length is not known up front.
+            del response.headers["Content-Length"]
+        else:
+            compressed = precompressed.get(name)
+            if compressed is None:
+                compressed = encoding.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The body is no longer byte-for-byte equal to what the ETag described.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = name
+
+        return response
+
+
+class SlowQueryMiddleware:
+    """Log the slow queries run for each request (see ``slow_queries``).
+
+    Disabled when ``SLOW_QUERY_THRESHOLD_MS`` is 0.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SLOW_QUERY_THRESHOLD_MS:
+            return self.get_response(request)
+
+        recorder = SlowQueryRecorder(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            return self.get_response(request)
+
+
+class MetricsMiddleware:
+    """Count each request, its latency and its queries (see ``metrics``).
+
+    Disabled when ``METRICS_ROUTE`` is empty.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ROUTE:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        started = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        registry.record_request(
+            view=get_view_name(request) or "unresolved",
+            method=request.method,
+            status=response.status_code,
+            duration=perf_counter() - started,
+            queries=counter.count,
+            query_time=counter.duration,
+        )
+        return response
@@ -0,0 +1,115 @@
+from rest_framework.renderers import JSONRenderer
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional.
+    orjson = None
+
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+class JSONFragment:
+    """Pre-encoded JSON value that is spliced verbatim into rendered output."""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded):
+        self.encoded = encoded
+
+
+def has_fragment(values):
+    """Return True if a fragment appears in the values or one level below."""
+    for value in values:
+        if isinstance(value, JSONFragment):
+            return True
+        if isinstance(value, (list, tuple)) and any(
+            isinstance(item, JSONFragment) for item in value
+        ):
+            return True
+        if isinstance(value, dict) and any(
+            isinstance(item, JSONFragment) for item in value.values()
+        ):
+            return True
+    return False
+
+
+def resolve_fragments(data):
+    """Return the data with every fragment decoded back into Python values."""
+    if isinstance(data, JSONFragment):
+        return json.loads(data.encoded)
+    if isinstance(data, dict):
+        return {key: resolve_fragments(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [resolve_fragments(item) for item in data]
+    return data
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer that encodes with orjson when it is installed.
+
+    Falls back to the stdlib encoder, with DRF's settings, when orjson is
+    missing or cannot encode the data. ``JSONFragment`` values found in the
+    top levels of the data are spliced in without being encoded again.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            # Pretty printing (e.g. the browsable API) is never a hot path.
+            return super().render(
+                resolve_fragments(data), accepted_media_type, renderer_context
+            )
+
+        return self.encode(data)
+
+    def encode(self, data):
+        if isinstance(data, JSONFragment):
+            return data.encoded
+        if isinstance(data, dict) and has_fragment(data.values()):
+            return b"{%s}" % b",".join(
+                self.dumps(str(key)) + b":" + self.encode(value)
+                for key, value in data.items()
+            )
+        if isinstance(data, (list, tuple)) and has_fragment(data):
+            return b"[%s]" % b",".join(self.encode(item) for item in data)
+        return self.dumps(data)
+
+    def dumps(self, data):
+        if orjson is not None and self.compact and not self.ensure_ascii:
+            try:
+                encoded = orjson.dumps(
+                    data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+                )
+            except TypeError:
+                # orjson.JSONEncodeError, e.g. for integers over 64 bits.
+                pass
+            else:
+                # Keep the output a strict JavaScript subset, like DRF does.
+                if b"\xe2\x80\xa8" in encoded or b"\xe2\x80\xa9" in encoded:
+                    encoded = encoded.replace(b"\xe2\x80\xa8", b"\\u2028")
+                    encoded = encoded.replace(b"\xe2\x80\xa9", b"\\u2029")
+                return encoded
+
+        ret = json.dumps(
+            data,
+            cls=self.encoder_class,
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=(",", ":") if self.compact else (", ", ": "),
+        )
+        ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode()
+
+
+def encode_fragment(data):
+    """Encode data once into a fragment for later splicing."""
+    return JSONFragment(FastJSONRenderer().encode(data))
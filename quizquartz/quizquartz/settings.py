@@ -31,6 +31,9 @@ DEBUG = env.bool("DEBUG", default=False)
 
 ALLOWED_HOSTS = []
 
+# SECURITY WARNING: keep the admin route secret!
+ADMIN_ROUTE = env("ADMIN_ROUTE")
+
 
 # Application definition
 
@@ -44,6 +47,7 @@ INSTALLED_APPS = [
     # Custom apps
     "accounts.apps.AccountsConfig",
     "quizzes.apps.QuizzesConfig",
+    "rooms.apps.RoomsConfig",
     # Third-party apps
     "rest_framework",
     "rest_framework.authtoken",
@@ -51,7 +55,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "quizquartz.middleware.MetricsMiddleware",  # Prometheus metrics
     "django.middleware.security.SecurityMiddleware",
+    "quizquartz.middleware.SlowQueryMiddleware",  # slow query log
+    "quizquartz.middleware.CompressionMiddleware",  # gzip, br and zstd responses
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # middleware for corsheaders
     "django.middleware.common.CommonMiddleware",
@@ -105,6 +112,16 @@ DATABASES = {
 # }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Shared by the worker processes: redis://host:port/db, pymemcache://host:port
+# or dbcache://table. Without CACHE_URL, each process has its own cache in
+# local memory, and the response caches of the quiz API are off by default.
+CACHE_URL = env("CACHE_URL", default="")
+CACHES = {"default": env.cache_url_config(CACHE_URL or "locmemcache://")}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -124,6 +141,52 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+
+# Hasher for new passwords: pbkdf2, scrypt or argon2 (argon2 needs argon2-cffi).
+# Hashes made by the other hashers or with other work factors keep verifying
+# and are rehashed with these settings on the next successful login.
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="pbkdf2")
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=1_000_000)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int("PASSWORD_SCRYPT_WORK_FACTOR", default=2**14)
+PASSWORD_ARGON2_TIME_COST = env.int("PASSWORD_ARGON2_TIME_COST", default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int("PASSWORD_ARGON2_MEMORY_COST", default=102400)
+PASSWORD_ARGON2_PARALLELISM = env.int("PASSWORD_ARGON2_PARALLELISM", default=8)
+
+CONFIGURABLE_PASSWORD_HASHERS = {
+    "pbkdf2": "accounts.hashers.ConfigurablePBKDF2PasswordHasher",
+    "scrypt": "accounts.hashers.ConfigurableScryptPasswordHasher",
+    "argon2": "accounts.hashers.ConfigurableArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [CONFIGURABLE_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher
+    for name, hasher in CONFIGURABLE_PASSWORD_HASHERS.items()
+    if name != PASSWORD_HASHER
+]
+
+# Threads that run the password hashing views (login, registration, password
+# change) when served over ASGI, which bounds the number of concurrent hashes.
+# 0 runs them like any other view.
+PASSWORD_HASHING_THREADS = env.int("PASSWORD_HASHING_THREADS", default=0)
+
+
+# Validation of unique fields (username, email, nickname, quiz group title):
+# "query" checks them all with one combined query before saving, "constraint"
+# skips the query and maps unique constraint violations to the same errors.
+UNIQUE_VALIDATION = env("UNIQUE_VALIDATION", default="query")
+
+
+# Login settings
+
+# Create a Django session on API login. Clients authenticate with the token, so
+# turning this off saves a session write per login.
+LOGIN_CREATE_SESSION = env.bool("LOGIN_CREATE_SESSION", default=True)
+
+# Update User.last_login on every login, including admin logins.
+LOGIN_UPDATE_LAST_LOGIN = env.bool("LOGIN_UPDATE_LAST_LOGIN", default=True)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -155,19 +218,172 @@ AUTH_USER_MODEL = "accounts.User"
 # Rest framework settings
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "quizquartz.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.TokenAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "quizquartz.throttling.SharedAnonRateThrottle",
+        "quizquartz.throttling.SharedUserRateThrottle",
+        "quizquartz.throttling.SharedScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",
         "user": "1000/day",
+        # Per-view scopes, set with throttle_scope on the view.
+        "login": env("THROTTLE_RATE_LOGIN", default="10/min"),
+        "registration": env("THROTTLE_RATE_REGISTRATION", default="5/hour"),
+        "write": env("THROTTLE_RATE_WRITE", default="60/min"),
     },
 }
 
+# Store shared by the worker processes for throttle counters.
+# sqlite:///<absolute path> or redis://host:port/db
+THROTTLE_STORE_URL = env(
+    "THROTTLE_STORE_URL", default=f"sqlite:///{BASE_DIR / 'throttle.sqlite3'}"
+)
+
+
+# Quiz API settings
+
+# Serialize list endpoints from .values() rows instead of DRF serializer fields.
+FAST_LIST_SERIALIZATION = env.bool("FAST_LIST_SERIALIZATION", default=False)
+
+# Seconds to cache pre-encoded JSON of each quiz and quiz group in list
+# responses, keyed by updated_at and by the group title and author nickname
+# each one embeds. 0 disables the fragment cache.
+JSON_FRAGMENT_CACHE_TIMEOUT = env.int("JSON_FRAGMENT_CACHE_TIMEOUT", default=300)
+
+# Seconds to cache public quiz API GET responses, stored precompressed.
+# 0 disables the response cache. Writes invalidate it in the shared cache
+# only, so it defaults to 0 without CACHE_URL: a process-local cache would
+# serve the other workers' stale responses.
+RESPONSE_CACHE_TIMEOUT = env.int(
+    "RESPONSE_CACHE_TIMEOUT", default=60 if CACHE_URL else 0
+)
+
+# Seconds the sync watermark trails the current time, so that rows written by
+# transactions still in flight are not skipped.
+SYNC_WATERMARK_LAG = env.int("SYNC_WATERMARK_LAG", default=5)
+
+# Rows deleted per transaction by the purge_deleted command, which removes
+# soft-deleted users, quiz groups and quizzes.
+PURGE_BATCH_SIZE = env.int("PURGE_BATCH_SIZE", default=500)
+
+# Days deletions stay visible to delta sync. The compact_tombstones command
+# removes older tombstones, and clients syncing from before that are told to
+# resync from scratch.
+SYNC_TOMBSTONE_RETENTION = env.int("SYNC_TOMBSTONE_RETENTION", default=30)
+
+# Near-duplicate questions on quiz create/update: "warn" adds a warning to the
+# response, "block" rejects the quiz, "off" skips the check. Questions are
+# near-duplicates at this Jaccard similarity of their character shingles.
+QUIZ_DUPLICATE_CHECK = env("QUIZ_DUPLICATE_CHECK", default="warn")
+QUIZ_DUPLICATE_THRESHOLD = env.float("QUIZ_DUPLICATE_THRESHOLD", default=0.8)
+
+# Related quizzes kept per quiz by the build_recommendations command. Tags and
+# groups with more quizzes than RECOMMENDATION_MAX_POSTING are ignored.
+RECOMMENDATION_COUNT = env.int("RECOMMENDATION_COUNT", default=10)
+RECOMMENDATION_MAX_POSTING = env.int("RECOMMENDATION_MAX_POSTING", default=5000)
+
+# Quizzes per page embedded in quizgroup/<id>/?include=quizzes.
+GROUP_QUIZZES_PAGE_SIZE = env.int("GROUP_QUIZZES_PAGE_SIZE", default=50)
+
+# IDs accepted per quiz/batch/ request, and seconds each quiz it serializes
+# is cached (dropped early by any quiz API write). 0 disables the cache, the
+# default without CACHE_URL, like the response cache.
+QUIZ_BATCH_MAX_IDS = env.int("QUIZ_BATCH_MAX_IDS", default=100)
+QUIZ_BATCH_CACHE_TIMEOUT = env.int(
+    "QUIZ_BATCH_CACHE_TIMEOUT", default=30 if CACHE_URL else 0
+)
+
+# Quizzes a reviewer may claim from the moderation queue at once, and seconds
+# the claim lasts before the quizzes go back to the queue.
+MODERATION_BATCH_SIZE = env.int("MODERATION_BATCH_SIZE", default=20)
+MODERATION_LEASE_SECONDS = env.int("MODERATION_LEASE_SECONDS", default=600)
+
+# Seconds between the writes of the quiz and quiz group detail hits counted by
+# each process. 0 disables the counter.
+HIT_COUNTER_FLUSH_INTERVAL = env.int("HIT_COUNTER_FLUSH_INTERVAL", default=60)
+
+# The warm_cache command precomputes the public lists and this many of the
+# details most requested over the last WARM_CACHE_HIT_WINDOW days, with up to
+# WARM_CACHE_THREADS requests at once.
+WARM_CACHE_DETAILS = env.int("WARM_CACHE_DETAILS", default=100)
+WARM_CACHE_HIT_WINDOW = env.int("WARM_CACHE_HIT_WINDOW", default=7)
+WARM_CACHE_THREADS = env.int("WARM_CACHE_THREADS", default=4)
+
+
+# Room settings
+
+# Pub/sub between the WebSocket connections of the rooms: memory:// within
+# one process, or redis://host:port/db across processes (needs redis).
+ROOM_BROKER_URL = env("ROOM_BROKER_URL", default="memory://")
+
+# Messages queued for a room client before it is dropped as too slow.
+ROOM_SEND_QUEUE_SIZE = env.int("ROOM_SEND_QUEUE_SIZE", default=64)
+
+# Seconds between the answer counts sent to a room's host during a round.
+ROOM_PROGRESS_INTERVAL = env.float("ROOM_PROGRESS_INTERVAL", default=0.5)
+
+# Store ranking the leaderboards: memory:// keeps sorted sets in each process,
+# caught up with the table every LEADERBOARD_REFRESH_INTERVAL seconds, and
+# redis://host:port/db shares Redis sorted sets (needs redis).
+LEADERBOARD_STORE_URL = env("LEADERBOARD_STORE_URL", default="memory://")
+LEADERBOARD_REFRESH_INTERVAL = env.int("LEADERBOARD_REFRESH_INTERVAL", default=5)
+
+# Scorers listed by the leaderboard views by default and at most.
+LEADERBOARD_SIZE = env.int("LEADERBOARD_SIZE", default=10)
+LEADERBOARD_MAX_SIZE = env.int("LEADERBOARD_MAX_SIZE", default=100)
+
+
+# Slow query log settings
+
+# Queries taking at least this many milliseconds during a request are logged
+# with their fingerprint, view and EXPLAIN plan. 0 disables the log.
+SLOW_QUERY_THRESHOLD_MS = env.int("SLOW_QUERY_THRESHOLD_MS", default=500)
+
+# Capture EXPLAIN plans of slow SELECTs, once per query fingerprint and
+# interval (in seconds) in each process.
+SLOW_QUERY_EXPLAIN = env.bool("SLOW_QUERY_EXPLAIN", default=True)
+SLOW_QUERY_EXPLAIN_INTERVAL = env.int("SLOW_QUERY_EXPLAIN_INTERVAL", default=300)
+
+# File the slow query log is appended to, read by slow_query_report.
+# Logged to the console when empty.
+SLOW_QUERY_LOG_FILE = env("SLOW_QUERY_LOG_FILE", default="")
+
+
+# Metrics settings
+
+# Secret route of the Prometheus metrics endpoint, like ADMIN_ROUTE (e.g.
+# "metrics-<random>/"). Empty disables the endpoint and the collection.
+METRICS_ROUTE = env("METRICS_ROUTE", default="")
+
+# Directory each worker process writes its metrics to, so that the endpoint
+# reports the sum of all of them (under gunicorn, for instance). Empty reports
+# the process answering the scrape only. Clear it on deploy, like the counters
+# of the old workers.
+METRICS_DIR = env("METRICS_DIR", default="")
+
+# Seconds between the writes of a process's metrics to METRICS_DIR.
+METRICS_FLUSH_INTERVAL = env.int("METRICS_FLUSH_INTERVAL", default=5)
+
+
+# Response compression settings
+
+# Responses under these paths are compressed. Auth responses are left out
+# because they carry tokens next to user-supplied input (BREACH).
+COMPRESSION_PATH_PREFIXES = ["/quiz-api/"]
+
+# Smaller bodies are sent as is.
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)
+
+# Compress streaming responses chunk by chunk, flushing after each chunk.
+COMPRESSION_STREAMING = env.bool("COMPRESSION_STREAMING", default=True)
+
 
 # Cors settings
 
@@ -195,6 +411,12 @@ LOGGING = {
             "handlers": ["console"],
             "level": "DEBUG",
         },
+        # Logger for the slow query log
+        "quizquartz.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
     # Handler settings
     "handlers": {
@@ -203,9 +425,20 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "dev",
         },
+        # One JSON object per line, read by the slow_query_report command.
+        "slow_queries": (
+            {
+                "class": "logging.handlers.WatchedFileHandler",
+                "filename": SLOW_QUERY_LOG_FILE,
+                "formatter": "message",
+            }
+            if SLOW_QUERY_LOG_FILE
+            else {"class": "logging.StreamHandler", "formatter": "dev"}
+        ),
     },
     # Formatter settings
     "formatters": {
+        "message": {"format": "%(message)s"},
         "dev": {
             "format": "\t".join(
                 [
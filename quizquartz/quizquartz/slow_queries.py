@@ -0,0 +1,108 @@
+"""Slow query log, recorded with database execute wrappers.
+
+Queries taking at least ``SLOW_QUERY_THRESHOLD_MS`` are logged to the
+``quizquartz.slow_queries`` logger as one JSON object per line: the SQL, its
+fingerprint (literals and IN lists normalized, so that repeats of a query
+share it), the view that ran it, the duration and the EXPLAIN plan of
+SELECTs. A plan is captured at most once per fingerprint and
+``SLOW_QUERY_EXPLAIN_INTERVAL`` seconds in each process. The
+slow_query_report command aggregates the log into the top queries by total
+time.
+"""
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from time import monotonic, perf_counter
+import json
+import logging
+import re
+
+logger = logging.getLogger("quizquartz.slow_queries")
+
+FINGERPRINT_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+"), "(...)"),
+]
+
+
+def fingerprint(sql):
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def get_view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    view = getattr(match.func, "view_class", match.func)
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+# Fingerprint -> monotonic time of its last EXPLAIN, in this process.
+explained_at = {}
+
+
+class SlowQueryRecorder:
+    """Execute wrapper logging the queries run for a request above a threshold."""
+
+    def __init__(self, request=None):
+        self.request = request
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+
+        started = perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (perf_counter() - started) * 1000
+        if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.record(sql, params, many, context["connection"], duration)
+        return result
+
+    def record(self, sql, params, many, connection, duration):
+        key = fingerprint(sql)
+        entry = {
+            "fingerprint": key,
+            "sql": sql,
+            "view": get_view_name(self.request),
+            "duration_ms": round(duration, 2),
+            "database": connection.alias,
+        }
+        if not many and self.should_explain(key, sql):
+            entry["plan"] = self.explain(sql, params, connection)
+        logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def should_explain(self, key, sql):
+        if not settings.SLOW_QUERY_EXPLAIN:
+            return False
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            return False
+        now = monotonic()
+        last = explained_at.get(key)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        explained_at[key] = now
+        return True
+
+    def explain(self, sql, params, connection):
+        """Return the plan as a list of rows, or None if it cannot be had."""
+        prefix = connection.ops.explain_query_prefix()
+        self.explaining = True
+        try:
+            # In a savepoint, so that a failure cannot break the request's
+            # transaction.
+            with transaction.atomic(
+                using=connection.alias
+            ), connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                return [list(row) for row in cursor.fetchall()]
+        except DatabaseError:
+            return None
+        finally:
+            self.explaining = False
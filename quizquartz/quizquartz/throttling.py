@@ -0,0 +1,155 @@
+"""Throttle classes backed by a store shared between worker processes.
+
+DRF's throttles keep a list of request timestamps per key in the default
+cache, which is per process with LocMemCache and O(n) to trim. These classes
+use GCRA (generic cell rate algorithm) instead: one "theoretical arrival time"
+per key, updated atomically in the store configured by ``THROTTLE_STORE_URL``:
+
+    sqlite:///path/to/throttle.sqlite3   shared by the processes of one host
+    redis://host:6379/0                  shared by every host (needs redis)
+"""
+
+from django.conf import settings
+from rest_framework import throttling
+from .metrics import registry
+from functools import lru_cache
+from urllib.parse import urlparse
+import sqlite3
+import threading
+
+try:
+    import redis
+except ImportError:  # redis is optional.
+    redis = None
+
+
+class SQLiteThrottleStore:
+    """GCRA store in a local SQLite file, one row per throttle key."""
+
+    # Expired rows are equivalent to missing ones and are purged now and then.
+    purge_interval = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.calls = 0
+
+    def get_connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle "
+                "(key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID"
+            )
+            self.local.connection = connection
+        return connection
+
+    def acquire(self, key, interval, period, now):
+        """Count one request; return None if allowed, else seconds to wait."""
+        connection = self.get_connection()
+        params = {"key": key, "now": now, "interval": interval, "period": period}
+
+        # A single statement, so concurrent processes cannot interleave.
+        allowed = connection.execute(
+            "INSERT INTO throttle (key, tat) VALUES (:key, :now + :interval) "
+            "ON CONFLICT (key) DO UPDATE SET tat = max(tat, :now) + :interval "
+            "WHERE max(tat, :now) + :interval - :now <= :period "
+            "RETURNING tat",
+            params,
+        ).fetchone()
+
+        self.calls += 1
+        if self.calls % self.purge_interval == 0:
+            connection.execute("DELETE FROM throttle WHERE tat < ?", (now,))
+
+        if allowed is not None:
+            return None
+        (tat,) = connection.execute(
+            "SELECT tat FROM throttle WHERE key = ?", (key,)
+        ).fetchone()
+        return max(tat, now) + interval - period - now
+
+
+class RedisThrottleStore:
+    """GCRA store in Redis (or any server speaking its protocol)."""
+
+    script = """
+        local now = tonumber(ARGV[1])
+        local interval = tonumber(ARGV[2])
+        local period = tonumber(ARGV[3])
+        local tat = tonumber(redis.call("GET", KEYS[1]) or now)
+        local new_tat = math.max(tat, now) + interval
+        if new_tat - now > period then
+            return tostring(new_tat - period - now)
+        end
+        redis.call("SET", KEYS[1], new_tat, "PX", math.ceil(period * 1000))
+        return false
+    """
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+        self.acquire_script = self.client.register_script(self.script)
+
+    def acquire(self, key, interval, period, now):
+        """Count one request; return None if allowed, else seconds to wait."""
+        wait = self.acquire_script(keys=[key], args=[now, interval, period])
+        return None if wait is None else float(wait)
+
+
+@lru_cache(maxsize=None)
+def get_throttle_store(url):
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SQLiteThrottleStore(parsed.path)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisThrottleStore(url)
+    raise ValueError(f"Unsupported THROTTLE_STORE_URL: {url}")
+
+
+class GCRARateThrottle(throttling.SimpleRateThrottle):
+    """SimpleRateThrottle keeping O(1) state per key in the shared store.
+
+    ``num_requests`` per ``duration`` is enforced as one request every
+    ``duration / num_requests`` seconds, with bursts of up to ``num_requests``.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        store = get_throttle_store(settings.THROTTLE_STORE_URL)
+        self.wait_seconds = store.acquire(
+            key=self.key,
+            interval=self.duration / self.num_requests,
+            period=self.duration,
+            now=self.timer(),
+        )
+        if self.wait_seconds is None:
+            return True
+        registry.inc("quizquartz_throttle_rejections_total", (("scope", self.scope),))
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SharedAnonRateThrottle(throttling.AnonRateThrottle, GCRARateThrottle):
+    """AnonRateThrottle using the shared GCRA store."""
+
+
+class SharedUserRateThrottle(throttling.UserRateThrottle, GCRARateThrottle):
+    """UserRateThrottle using the shared GCRA store."""
+
+
+class SharedScopedRateThrottle(throttling.ScopedRateThrottle, GCRARateThrottle):
+    """ScopedRateThrottle using the shared GCRA store.
+
+    Views opt in with ``throttle_scope``; the rates live in
+    ``DEFAULT_THROTTLE_RATES`` under the scope name.
+    """
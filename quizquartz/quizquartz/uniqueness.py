@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+
+def find_taken_fields(model, values, exclude_pk=None):
+    """Return the fields whose value is used by another row, with one query."""
+    if not values:
+        return set()
+
+    condition = Q()
+    for field, value in values.items():
+        condition |= Q(**{field: value})
+    queryset = model.objects.filter(condition)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    # Let the database compare, so its collation decides like a unique index.
+    counts = queryset.aggregate(
+        **{
+            field: Count("pk", filter=Q(**{field: value}))
+            for field, value in values.items()
+        }
+    )
+    return {field for field, count in counts.items() if count}
+
+
+class UniqueFieldsMixin:
+    """Uniqueness checks for model serializers, driven by UNIQUE_VALIDATION.
+
+    "query": ``get_taken_fields`` checks every field of
+    ``unique_error_messages`` with one combined query during validation.
+    "constraint": validation skips the query and the database constraints
+    decide. ``save_unique`` turns the IntegrityError into the same message.
+    """
+
+    # Field name -> message, in the order the errors take precedence.
+    unique_error_messages = {}
+
+    def get_unique_values(self, data):
+        return {
+            field: data[field]
+            for field in self.unique_error_messages
+            if data.get(field) is not None
+        }
+
+    def get_taken_fields(self, data):
+        if settings.UNIQUE_VALIDATION == "constraint":
+            return set()
+        return find_taken_fields(
+            self.Meta.model,
+            self.get_unique_values(data),
+            exclude_pk=self.instance.pk if self.instance else None,
+        )
+
+    def unique_error(self, field, value):
+        return serializers.ValidationError(
+            {
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.unique_error_messages[field].format(value=value)
+                ]
+            }
+        )
+
+    def save_unique(self, save):
+        """Call save() and map a unique constraint violation to its message."""
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            values = self.get_unique_values(self.validated_data)
+            taken = find_taken_fields(
+                self.Meta.model,
+                values,
+                exclude_pk=self.instance.pk if self.instance else None,
+            )
+            for field in self.unique_error_messages:
+                if field in taken:
+                    raise self.unique_error(field, values[field])
+            raise
@@ -15,20 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.urls import path, include
 from django.contrib import admin
-from pathlib import Path
-import environ
-
-
-BASE_DIR = Path(__file__).resolve().parent.parent
-DOTENV_PATH = BASE_DIR / ".env"
-
-env = environ.Env()
-environ.Env.read_env(DOTENV_PATH)
+from .metrics import metrics_view
 
 urlpatterns = [
-    path(route=env("ADMIN_ROUTE"), view=admin.site.urls),  # Admin route is secret.
+    path(route=settings.ADMIN_ROUTE, view=admin.site.urls),  # Admin route is secret.
     path(route="auth-api/", view=include("accounts.urls")),
     path(route="quiz-api/", view=include("quizzes.urls")),
+    path(route="room-api/", view=include("rooms.urls")),
 ]
+
+if settings.METRICS_ROUTE:
+    # Metrics route is secret, like the admin route.
+    urlpatterns.append(path(route=settings.METRICS_ROUTE, view=metrics_view))
@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quizquartz.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf, and with it the views, now instead of on the first
+# request, so that workers forked from a preloaded master (gunicorn --preload)
+# start warm.
+get_resolver().url_patterns
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from quizquartz.admin_utils import ScalableAdminMixin
 from .models import Tag, QuizGroup, Quiz
 
 
@@ -11,16 +12,22 @@ class TagAdmin(admin.ModelAdmin):
 
 
 @admin.register(QuizGroup)
-class QuizGroupAdmin(admin.ModelAdmin):
+class QuizGroupAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("title", "created_by", "created_at", "updated_at", "id")
-    search_fields = ("title", "created_by__username")
+    list_select_related = ("created_by",)
+    search_fields = ("title",)
+    exact_search_fields = ("created_by__username",)
+    autocomplete_fields = ("created_by",)
     readonly_fields = ("id", "created_at", "updated_at")
     ordering = ("-created_at",)
 
 
 @admin.register(Quiz)
-class QuizAdmin(admin.ModelAdmin):
+class QuizAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("question", "related_group", "created_by", "id")
-    search_fields = ("question", "created_by__username", "related_group__title", "id")
+    list_select_related = ("related_group", "created_by")
+    search_fields = ("question",)
+    exact_search_fields = ("created_by__username", "related_group__title")
+    autocomplete_fields = ("created_by", "related_group", "tags")
     readonly_fields = ("id", "created_at", "updated_at")
     ordering = ("-created_at",)
@@ -0,0 +1,118 @@
+"""Near-duplicate question detection with MinHash and LSH banding.
+
+A question is normalized and cut into character shingles. Its MinHash
+signature has ``BANDS * ROWS`` values and is split into ``BANDS`` bands.
+Each band is hashed into a bucket stored in ``QuizSignatureBand``. Two
+questions share at least one bucket with high probability when their shingle
+sets are similar (about 50% Jaccard similarity and up with 16 bands of 4
+rows). Candidates found through the bucket index are then compared exactly.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from .models import Quiz, QuizSignatureBand
+from hashlib import blake2b
+from random import Random
+import unicodedata
+
+SHINGLE_SIZE = 3
+BANDS = 16
+ROWS = 4
+
+# Random XOR masks turn one 64-bit hash per shingle into BANDS * ROWS
+# pseudo-permutations. They are fixed so stored buckets stay comparable.
+MASKS = [Random(20240901 + i).getrandbits(64) for i in range(BANDS * ROWS)]
+
+# Quizzes compared exactly per write at most, however many share a bucket.
+MAX_CANDIDATES = 200
+
+
+def normalize_question(question):
+    text = unicodedata.normalize("NFKC", question).casefold()
+    return "".join(text.split())
+
+
+def get_shingles(question):
+    text = normalize_question(question)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def hash64(data):
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+
+def get_buckets(shingles):
+    """Return the LSH bucket of each band of the shingles' MinHash signature."""
+    hashes = [hash64(shingle.encode()) for shingle in shingles]
+    signature = [min(map(mask.__xor__, hashes)) for mask in MASKS]
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        digest = blake2b(
+            b"".join(value.to_bytes(8, "little") for value in rows), digest_size=8
+        ).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def find_similar_quizzes(shingles, buckets, exclude_pk=None):
+    """Return the IDs of live quizzes whose question is similar enough.
+
+    "Similar enough" is a Jaccard similarity of the shingles of at least
+    ``QUIZ_DUPLICATE_THRESHOLD``. Only quizzes sharing a bucket are compared.
+    """
+    condition = Q()
+    for band, bucket in enumerate(buckets):
+        condition |= Q(band=band, bucket=bucket)
+    candidates = QuizSignatureBand.objects.filter(
+        condition, quiz__deleted_at__isnull=True
+    )
+    if exclude_pk is not None:
+        candidates = candidates.exclude(quiz_id=exclude_pk)
+    candidates = candidates.values_list("quiz_id", flat=True).distinct()
+
+    threshold = settings.QUIZ_DUPLICATE_THRESHOLD
+    questions = Quiz.objects.filter(pk__in=list(candidates[:MAX_CANDIDATES]))
+    return [
+        pk
+        for pk, question in questions.values_list("pk", "question")
+        if jaccard(shingles, get_shingles(question)) >= threshold
+    ]
+
+
+def insert_buckets(signatures):
+    """Insert the bands of (quiz pk, buckets) pairs with one executemany.
+
+    Used for bulk indexing, where building a model instance per band would
+    cost more than computing the signature.
+    """
+    opts = QuizSignatureBand._meta
+    quote = connection.ops.quote_name
+    quiz_field = opts.get_field("quiz")
+    sql = "INSERT INTO {table} ({quiz}, {band}, {bucket}) VALUES (%s, %s, %s)".format(
+        table=quote(opts.db_table),
+        quiz=quote(quiz_field.column),
+        band=quote(opts.get_field("band").column),
+        bucket=quote(opts.get_field("bucket").column),
+    )
+    params = []
+    for pk, buckets in signatures:
+        quiz_pk = quiz_field.get_db_prep_value(pk, connection)
+        params.extend((quiz_pk, band, bucket) for band, bucket in enumerate(buckets))
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def save_buckets(quiz_pk, buckets):
+    with transaction.atomic():
+        QuizSignatureBand.objects.filter(quiz_id=quiz_pk).delete()
+        insert_buckets([(quiz_pk, buckets)])
@@ -0,0 +1,105 @@
+from datetime import datetime, time
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ParseError
+from rest_framework.filters import BaseFilterBackend
+from .models import Quiz
+from uuid import UUID
+
+TRUE_VALUES = ("true", "1")
+FALSE_VALUES = ("false", "0")
+
+
+class QuizFilterBackend(BaseFilterBackend):
+    """Filter quizzes by query parameters.
+
+    Supported parameters:
+        tag: Tag name. Repeat it or separate names with commas for several tags.
+        tag_mode: "all" (default) requires every tag, "any" requires one of them.
+        group: Quiz group ID.
+        created_by: Nickname of the author.
+        is_checked: "true" or "false".
+        created_after: ISO 8601 date or datetime.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        tag_names = self.get_tag_names(params)
+        if tag_names:
+            queryset = self.filter_tags(
+                queryset, tag_names, params.get("tag_mode", "all")
+            )
+        if "group" in params:
+            queryset = queryset.filter(
+                related_group_id=self.parse_uuid(params["group"]),
+                related_group__deleted_at__isnull=True,
+            )
+        if "created_by" in params:
+            queryset = queryset.filter(created_by__nickname=params["created_by"])
+        if "is_checked" in params:
+            queryset = queryset.filter(is_checked=self.parse_bool(params["is_checked"]))
+        if "created_after" in params:
+            queryset = queryset.filter(
+                created_at__gt=self.parse_timestamp(params["created_after"])
+            )
+
+        return queryset
+
+    def get_tag_names(self, params):
+        names = []
+        for value in params.getlist("tag"):
+            names.extend(name.strip() for name in value.split(",") if name.strip())
+        return list(dict.fromkeys(names))
+
+    def filter_tags(self, queryset, tag_names, tag_mode):
+        # Both modes compile to a single subquery on the through table, so the
+        # main query never joins tags and never needs DISTINCT.
+        through = Quiz.tags.through.objects.filter(tag__name__in=tag_names)
+
+        if tag_mode == "any":
+            return queryset.filter(Exists(through.filter(quiz_id=OuterRef("pk"))))
+        if tag_mode == "all":
+            matched = (
+                through.values("quiz_id")
+                .annotate(tag_count=Count("tag_id"))
+                .filter(tag_count=len(tag_names))
+                .values("quiz_id")
+            )
+            return queryset.filter(pk__in=matched)
+
+        raise ParseError(
+            detail={"error": "tag_modeには all か any を指定してください。"}
+        )
+
+    def parse_uuid(self, value):
+        try:
+            return UUID(value)
+        except ValueError:
+            raise ParseError(detail={"error": "無効なクイズグループID形式です。"})
+
+    def parse_bool(self, value):
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise ParseError(
+            detail={"error": "is_checkedには true か false を指定してください。"}
+        )
+
+    def parse_timestamp(self, value):
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                date = parse_date(value)
+                if date is not None:
+                    parsed = datetime.combine(date, time.min)
+        except ValueError:
+            parsed = None
+
+        if parsed is None:
+            raise ParseError(detail={"error": "無効な日時形式です。"})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import connections
+from quizquartz.metrics import registry
+from quizquartz.renderers import JSONFragment, encode_fragment
+from hashlib import md5
+
+
+def make_fragment_key(model, pk, version, field_names):
+    fields_digest = md5(",".join(field_names).encode()).hexdigest()[:12]
+    # Hashed, as versions may be text such as nicknames.
+    version = ":".join(str(value) for value in version)
+    version_digest = md5(version.encode()).hexdigest()[:16]
+    return (
+        f"quizzes:fragment:{model._meta.model_name}:{pk}:{version_digest}:"
+        f"{fields_digest}"
+    )
+
+
+def get_cached_fragments(
+    queryset, field_names, serialize, timeout, version_fields=("updated_at",)
+):
+    """Return one JSON fragment per object in the queryset, in queryset order.
+
+    Fragments are cached per object, keyed by its ``version_fields``
+    (``updated_at`` by default, plus the versions of any related objects the
+    fragment embeds) and the selected fields, so only
+    new or changed objects are passed to ``serialize`` (a callable turning a
+    queryset into a list of dicts). Returns None when the queryset changed
+    underneath and the caller should serialize without the cache.
+    """
+    versions = list(queryset.prefetch_related(None).values_list("pk", *version_fields))
+    keys = {
+        pk: make_fragment_key(queryset.model, pk, version, field_names)
+        for pk, *version in versions
+    }
+    fragments = cache.get_many(keys.values())
+    missing = sorted(pk for pk, key in keys.items() if key not in fragments)
+    registry.record_cache(
+        "fragment", hits=len(keys) - len(missing), misses=len(missing)
+    )
+
+    if missing:
+        # Misses are fetched in primary key order so that each serialized item
+        # can be matched to its key even when "id" is not a selected field.
+        batch_size = connections[queryset.db].features.max_query_params
+        batch_size = batch_size or len(missing)
+        new_fragments = {}
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            items = serialize(queryset.filter(pk__in=batch).order_by("pk"))
+            if len(items) != len(batch):
+                return None
+            for pk, item in zip(batch, items):
+                new_fragments[keys[pk]] = encode_fragment(item).encoded
+
+        cache.set_many(new_fragments, timeout=timeout)
+        fragments.update(new_fragments)
+
+    return [JSONFragment(fragments[keys[pk]]) for pk, *_ in versions]
@@ -0,0 +1,101 @@
+"""Per-path hit counter of the quiz API detail views.
+
+Each process counts the successful GETs of quiz and quiz group details in
+memory and adds them to the day's ``PathHit`` rows every
+``HIT_COUNTER_FLUSH_INTERVAL`` seconds, with one UPDATE per distinct count
+rather than per path. The warm_cache command reads back the paths most
+requested over the last ``WARM_CACHE_HIT_WINDOW`` days.
+"""
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from .models import PathHit
+from collections import Counter, defaultdict
+from datetime import timedelta
+from time import monotonic
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class HitCounter:
+    """Hits counted by this process since its last flush."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = Counter()
+        self.flushed_at = monotonic()
+
+    def add(self, path):
+        interval = settings.HIT_COUNTER_FLUSH_INTERVAL
+        if not interval:
+            return
+        with self.lock:
+            self.hits[path] += 1
+            if monotonic() - self.flushed_at < interval:
+                return
+            hits, self.hits = self.hits, Counter()
+            self.flushed_at = monotonic()
+        self.save(hits)
+
+    def flush(self):
+        with self.lock:
+            hits, self.hits = self.hits, Counter()
+            self.flushed_at = monotonic()
+        self.save(hits)
+
+    def save(self, hits):
+        if not hits:
+            return
+        paths_by_count = defaultdict(list)
+        for path, count in hits.items():
+            paths_by_count[count].append(path)
+
+        day = timezone.localdate()
+        try:
+            with transaction.atomic():
+                PathHit.objects.bulk_create(
+                    [PathHit(path=path, day=day) for path in hits],
+                    ignore_conflicts=True,
+                )
+                for count, paths in paths_by_count.items():
+                    PathHit.objects.filter(path__in=paths, day=day).update(
+                        hits=F("hits") + count
+                    )
+        except DatabaseError:
+            # Losing a batch of hits only makes the ranking less precise.
+            logger.exception("Could not save %d path hits", len(hits))
+
+
+hit_counter = HitCounter()
+
+# Workers forked from a process that counted start from zero.
+os.register_at_fork(after_in_child=hit_counter.reset)
+
+
+def get_hit_window_start():
+    return timezone.localdate() - timedelta(days=settings.WARM_CACHE_HIT_WINDOW - 1)
+
+
+def get_popular_paths(count):
+    """Return the most requested paths of the last ``WARM_CACHE_HIT_WINDOW`` days."""
+    return list(
+        PathHit.objects.filter(day__gte=get_hit_window_start())
+        .values("path")
+        .annotate(total=Sum("hits"))
+        .order_by("-total", "path")
+        .values_list("path", flat=True)[:count]
+    )
+
+
+def delete_old_path_hits():
+    """Delete the days before the window, which are no longer read."""
+    deleted, _ = PathHit.objects.filter(day__lt=get_hit_window_start()).delete()
+    return deleted
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from quizzes.fast_serializers import FastQuizSerializer
+from quizzes.models import Tag, QuizGroup, Quiz
+from quizzes.serializers import QuizSerializer
+from time import perf_counter
+from uuid import uuid4
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare QuizSerializer with FastQuizSerializer on generated quizzes. "
+        "The generated rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quizzes", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.create_quizzes(options["quizzes"])
+            queryset = Quiz.objects.order_by("-created_at")
+            optimized = QuizSerializer.optimize_queryset(queryset, {})
+
+            drf_time, drf_data = self.measure(
+                lambda: QuizSerializer(optimized.all(), many=True).data,
+                options["repeat"],
+            )
+            fast_time, fast_data = self.measure(
+                lambda: FastQuizSerializer(queryset.all()).data,
+                options["repeat"],
+            )
+            transaction.set_rollback(True)
+
+        renderer = JSONRenderer()
+        identical = renderer.render(drf_data) == renderer.render(fast_data)
+
+        self.stdout.write(f"quizzes:      {options['quizzes']}")
+        self.stdout.write(f"DRF:          {drf_time * 1000:.1f} ms")
+        self.stdout.write(f"fast:         {fast_time * 1000:.1f} ms")
+        self.stdout.write(f"speedup:      {drf_time / fast_time:.1f}x")
+        self.stdout.write(f"identical:    {identical}")
+
+    def measure(self, serialize, repeat):
+        best = None
+        for _ in range(repeat):
+            started = perf_counter()
+            data = serialize()
+            elapsed = perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
+
+    def create_quizzes(self, count):
+        suffix = uuid4().hex[:8]
+        user = User.objects.create_user(
+            username=f"benchmark_{suffix}",
+            email=f"benchmark_{suffix}@example.com",
+            password=uuid4().hex,
+            nickname=f"benchmark_{suffix}",
+        )
+        tags = Tag.objects.bulk_create(
+            [Tag(name=f"benchmark_{suffix}_{i}") for i in range(5)]
+        )
+        quiz_group = QuizGroup.objects.create(
+            title=f"benchmark_{suffix}", created_by=user
+        )
+        quizzes = Quiz.objects.bulk_create(
+            [
+                Quiz(
+                    question=f"問題 {i}",
+                    answer={"choices": ["A", "B", "C", "D"], "correct": i % 4},
+                    related_group=quiz_group if i % 2 else None,
+                    created_by=user,
+                )
+                for i in range(count)
+            ]
+        )
+        Quiz.tags.through.objects.bulk_create(
+            [
+                Quiz.tags.through(quiz_id=quiz.id, tag_id=tags[j].id)
+                for i, quiz in enumerate(quizzes)
+                for j in range(i % 3)
+            ]
+        )
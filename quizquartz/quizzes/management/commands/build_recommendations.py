@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from quizzes.recommendations import build_recommendations
+from quizzes.response_cache import bump_response_cache_version
+from time import perf_counter
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the related quizzes served by quiz/<id>/related/. Only the "
+        "quizzes affected by changes since the last build are recomputed, "
+        "unless --full is given. Run it periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true")
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        built = build_recommendations(full=options["full"])
+        if built:
+            bump_response_cache_version()
+        self.stdout.write(
+            f"recommendations built: {built} in {perf_counter() - started:.1f} s"
+        )
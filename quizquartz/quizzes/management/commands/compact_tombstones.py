@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from quizzes.models import Tombstone
+from datetime import timedelta
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of objects deleted more than "
+        "SYNC_TOMBSTONE_RETENTION days ago. Delta sync clients that last "
+        "synced before then are told to resync from scratch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.PURGE_BATCH_SIZE
+        horizon = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION)
+        queryset = Tombstone.objects.filter(deleted_at__lt=horizon)
+        compacted = 0
+
+        while True:
+            batch = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            Tombstone.objects.filter(pk__in=batch).delete()
+            compacted += len(batch)
+
+        self.stdout.write(
+            f"tombstones older than {horizon:%Y-%m-%d %H:%M}: {compacted}"
+        )
@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from quizzes.duplicates import get_buckets, get_shingles, insert_buckets, jaccard
+from quizzes.models import QuizGroup, Quiz, QuizSignatureBand
+from quizzes.response_cache import bump_response_cache_version
+from itertools import groupby
+
+
+class Command(BaseCommand):
+    help = (
+        "Index quiz questions for near-duplicate detection, then report the "
+        "clusters of near-duplicate questions. With --delete, the newer copies "
+        "in a cluster are soft-deleted when they have the same author as the "
+        "oldest one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every signature instead of only the missing ones.",
+        )
+        parser.add_argument("--delete", action="store_true")
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.index(options["rebuild"])
+        clusters = self.find_clusters()
+
+        deleted = 0
+        for cluster in clusters:
+            kept, *others = cluster
+            self.stdout.write(
+                f"{len(cluster)} copies of {kept['id']}: {kept['question'][:60]!r}"
+            )
+            if options["delete"]:
+                deleted += self.delete_copies(kept, others)
+
+        self.stdout.write(f"clusters: {len(clusters)}")
+        if options["delete"]:
+            self.stdout.write(f"soft-deleted: {deleted}")
+
+    def index(self, rebuild):
+        queryset = Quiz.objects.all()
+        if rebuild:
+            QuizSignatureBand.objects.all().delete()
+        else:
+            queryset = queryset.filter(
+                ~Exists(QuizSignatureBand.objects.filter(quiz=OuterRef("pk")))
+            )
+
+        indexed = 0
+        batch = []
+        rows = queryset.values_list("pk", "question").iterator(
+            chunk_size=self.batch_size
+        )
+        for pk, question in rows:
+            batch.append((pk, get_buckets(get_shingles(question))))
+            if len(batch) == self.batch_size:
+                indexed += self.insert(batch)
+                batch = []
+        indexed += self.insert(batch)
+        self.stdout.write(f"indexed: {indexed}")
+
+    def insert(self, batch):
+        with transaction.atomic():
+            insert_buckets(batch)
+        if batch:
+            self.stdout.write(f"indexed: +{len(batch)}")
+        return len(batch)
+
+    def find_clusters(self):
+        """Return the near-duplicate clusters as lists of quizzes, oldest first."""
+        # Only buckets holding more than one quiz are read, in bucket order.
+        shared = QuizSignatureBand.objects.filter(
+            band=OuterRef("band"), bucket=OuterRef("bucket")
+        ).exclude(pk=OuterRef("pk"))
+        rows = (
+            QuizSignatureBand.objects.filter(
+                Exists(shared), quiz__deleted_at__isnull=True
+            )
+            .order_by("band", "bucket")
+            .values_list("band", "bucket", "quiz_id")
+            .iterator(chunk_size=self.batch_size)
+        )
+        # Each bucket member is compared with the first one only, which keeps
+        # crowded buckets linear; similar pairs usually share other bands too.
+        pairs = set()
+        for _, members in groupby(rows, key=lambda row: row[:2]):
+            first, *others = sorted(row[2] for row in members)
+            pairs.update((first, other) for other in others)
+
+        quizzes = self.load_quizzes({pk for pair in pairs for pk in pair})
+        threshold = settings.QUIZ_DUPLICATE_THRESHOLD
+        parents = {}
+
+        def find(pk):
+            while parents[pk] != pk:
+                pk = parents[pk]
+            return pk
+
+        for a, b in pairs:
+            if a not in quizzes or b not in quizzes:
+                continue
+            similarity = jaccard(quizzes[a]["shingles"], quizzes[b]["shingles"])
+            if similarity >= threshold:
+                parents.setdefault(a, a)
+                parents.setdefault(b, b)
+                parents[find(a)] = find(b)
+
+        clusters = {}
+        for pk in parents:
+            clusters.setdefault(find(pk), []).append(quizzes[pk])
+        return [
+            sorted(cluster, key=lambda quiz: quiz["created_at"])
+            for cluster in clusters.values()
+        ]
+
+    def load_quizzes(self, pks):
+        pks = list(pks)
+        quizzes = {}
+        for start in range(0, len(pks), self.batch_size):
+            for quiz in Quiz.objects.filter(
+                pk__in=pks[start : start + self.batch_size]
+            ).values(
+                "id", "question", "created_by_id", "related_group_id", "created_at"
+            ):
+                quiz["shingles"] = get_shingles(quiz["question"])
+                quizzes[quiz["id"]] = quiz
+        return quizzes
+
+    def delete_copies(self, kept, others):
+        copies = [
+            quiz for quiz in others if quiz["created_by_id"] == kept["created_by_id"]
+        ]
+        if not copies:
+            return 0
+
+        now = timezone.now()
+        with transaction.atomic():
+            Quiz.objects.filter(pk__in=[quiz["id"] for quiz in copies]).update(
+                deleted_at=now, updated_at=now
+            )
+            group_pks = {quiz["related_group_id"] for quiz in copies}
+            for quiz_group in QuizGroup.objects.filter(pk__in=group_pks):
+                quiz_group.refresh_summary()
+        bump_response_cache_version()
+        return len(copies)
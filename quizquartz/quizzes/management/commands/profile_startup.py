@@ -0,0 +1,197 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from collections import Counter
+from statistics import median
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Run in a fresh interpreter, like a new WSGI worker: load the application
+# (WSGI_APPLICATION), then serve one request. With "preload", the request is
+# served by a process forked once the application is loaded, like a worker of
+# gunicorn --preload, and timed from the fork. The host of the request is
+# allowed, as production hosts are rarely in ALLOWED_HOSTS where this runs.
+WORKER_SCRIPT = """
+import os, sys, time
+spawned_at = float(sys.argv[1])
+path, host, application_path, preload = sys.argv[2:]
+started_at = time.time()
+started = time.perf_counter()
+
+import django
+import django.core.wsgi
+imported = time.perf_counter()
+django.setup(set_prefix=False)
+ready = time.perf_counter()
+from django.conf import settings
+settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, host]
+from importlib import import_module
+module_name, name = application_path.rsplit(".", 1)
+application = getattr(import_module(module_name), name)
+loaded = time.perf_counter()
+
+from wsgiref.util import setup_testing_defaults
+import json
+if preload == "1":
+    forked_at = time.time()
+    if os.fork():
+        os.wait()
+        sys.exit()
+environ = {"PATH_INFO": path, "HTTP_HOST": host, "HTTP_ACCEPT": "application/json"}
+setup_testing_defaults(environ)
+statuses = []
+response = application(environ, lambda status, headers: statuses.append(status))
+b"".join(response)
+response.close()
+responded = time.perf_counter()
+
+print(json.dumps({
+    "interpreter": started_at - spawned_at,
+    "django import": imported - started,
+    "apps ready": ready - imported,
+    "application": loaded - ready,
+    "first request": responded - loaded,
+    "time to first response": (
+        time.time() - (forked_at if preload == "1" else spawned_at)
+    ),
+    "status": statuses[0],
+}))
+"""
+
+PHASES = [
+    "interpreter",
+    "django import",
+    "apps ready",
+    "application",
+    "first request",
+    "time to first response",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cold start of a fresh worker process: interpreter "
+        "startup, Django import, app loading (django.setup()), the WSGI "
+        "application and the first request, then the import time per package "
+        "and the slowest modules from python -X importtime. Use --settings to "
+        "profile another settings module, --preload to time workers forked "
+        "from a preloaded master (gunicorn --preload) and --compare to measure "
+        "the cut against workers of a baseline settings module started the "
+        "same way."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--path", default="/quiz-api/tag/")
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--preload",
+            action="store_true",
+            help="Time the first response from the fork of a preloaded master.",
+        )
+        parser.add_argument(
+            "--compare", metavar="SETTINGS_MODULE", help="Baseline settings module."
+        )
+
+    def handle(self, *args, **options):
+        settings_module = os.environ["DJANGO_SETTINGS_MODULE"]
+        timings = self.measure(settings_module, options, options["preload"])
+        mode = "forked from a preloaded master" if options["preload"] else "fresh"
+        self.stdout.write(f"settings:                {settings_module}")
+        self.stdout.write(f"workers:                 {mode}")
+        self.stdout.write(f"runs:                    {options['runs']} (medians)")
+        self.write_timings(timings)
+
+        if options["compare"]:
+            # Against workers started the same way, or the cut mostly measures
+            # the preloading.
+            baseline = self.measure(options["compare"], options, options["preload"])
+            self.stdout.write(f"\nbaseline:                {options['compare']}")
+            self.stdout.write(f"workers:                 {mode}")
+            self.write_timings(baseline)
+            cut = 1 - (
+                timings["time to first response"] / baseline["time to first response"]
+            )
+            self.stdout.write(f"\ncut:                     {cut:.0%}")
+
+        if not options["top"]:
+            return
+        imports = self.profile_imports(settings_module, options)
+        packages = Counter()
+        for module, self_time in imports.items():
+            packages[self.get_package(module)] += self_time
+        self.stdout.write(
+            f"\nimport time by package (self, {sum(imports.values()) / 1000:.0f} ms):"
+        )
+        for package, self_time in packages.most_common(options["top"]):
+            self.stdout.write(f"  {package:<40} {self_time / 1000:7.1f} ms")
+        self.stdout.write("\nslowest modules (self):")
+        for module, self_time in Counter(imports).most_common(options["top"]):
+            self.stdout.write(f"  {module:<40} {self_time / 1000:7.1f} ms")
+
+    def run_worker(self, settings_module, options, preload, *flags):
+        process = subprocess.run(
+            [
+                sys.executable,
+                *flags,
+                "-c",
+                WORKER_SCRIPT,
+                str(time.time()),
+                options["path"],
+                options["host"],
+                settings.WSGI_APPLICATION,
+                "1" if preload else "0",
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings_module},
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(f"The worker failed:\n{process.stderr[-2000:]}")
+        return process
+
+    def measure(self, settings_module, options, preload):
+        runs = [
+            json.loads(self.run_worker(settings_module, options, preload).stdout)
+            for _ in range(options["runs"])
+        ]
+        for run in runs:
+            # An error response may never reach a view: nothing to time.
+            if not run["status"].startswith("2"):
+                raise CommandError(
+                    f"The first request to {options['path']} returned "
+                    f"{run['status']} with {settings_module}. Use --path with "
+                    "a public GET."
+                )
+        timings = {phase: median(run[phase] for run in runs) for phase in PHASES}
+        timings["status"] = runs[-1]["status"]
+        return timings
+
+    def write_timings(self, timings):
+        for phase in PHASES:
+            label = f"{phase}:"
+            self.stdout.write(f"{label:<24} {timings[phase] * 1000:7.1f} ms")
+        self.stdout.write(f"{'status:':<24} {timings['status']}")
+
+    def profile_imports(self, settings_module, options):
+        """Return the self import time of each module, in microseconds."""
+        process = self.run_worker(settings_module, options, False, "-X", "importtime")
+        imports = {}
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            self_time, _, module = line[len("import time:") :].split("|")
+            if self_time.strip().isdigit():
+                imports[module.strip()] = int(self_time)
+        return imports
+
+    def get_package(self, module):
+        parts = module.split(".")
+        # Django's contrib apps are worth telling apart.
+        if parts[:2] == ["django", "contrib"]:
+            return ".".join(parts[:3])
+        return parts[0]
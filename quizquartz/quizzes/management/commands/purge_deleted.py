@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from quizzes.models import QuizGroup, Quiz
+from quizzes.response_cache import bump_response_cache_version
+from time import sleep
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete soft-deleted quizzes, quiz groups and users in bounded batches, "
+        "detaching the quizzes of deleted groups first. Safe to interrupt and "
+        "run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches, to let other writers in.",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"] or settings.PURGE_BATCH_SIZE
+        self.pause = options["pause"]
+
+        self.in_batches(
+            Quiz.all_objects.filter(deleted_at__isnull=False),
+            "deleted quizzes",
+            lambda batch: Quiz.all_objects.filter(pk__in=batch).delete(),
+        )
+        # Deleted groups keep their quizzes attached until now. Detaching them
+        # here, in batches, replaces the single large SET_NULL update the
+        # group deletion would otherwise cascade to.
+        detached = self.in_batches(
+            Quiz.objects.filter(related_group__deleted_at__isnull=False),
+            "quizzes detached from deleted groups",
+            lambda batch: Quiz.all_objects.filter(pk__in=batch).update(
+                related_group=None, updated_at=timezone.now()
+            ),
+        )
+        if detached:
+            bump_response_cache_version()
+        self.in_batches(
+            QuizGroup.all_objects.filter(deleted_at__isnull=False),
+            "deleted quiz groups",
+            lambda batch: QuizGroup.all_objects.filter(pk__in=batch).delete(),
+        )
+        self.in_batches(
+            User._base_manager.filter(deleted_at__isnull=False),
+            "deleted users",
+            lambda batch: User._base_manager.filter(pk__in=batch).delete(),
+        )
+
+    def in_batches(self, queryset, label, process):
+        """Process the queryset's primary keys batch by batch until none is left.
+
+        ``process`` must make the batch leave the queryset. Returns the number
+        of rows processed.
+        """
+        total = queryset.count()
+        done = 0
+
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    queryset.order_by("pk").values_list("pk", flat=True)[
+                        : self.batch_size
+                    ]
+                )
+                if not batch:
+                    break
+                process(batch)
+
+            done += len(batch)
+            total = max(total, done)
+            self.stdout.write(f"{label}: {done}/{total}")
+            if self.pause:
+                sleep(self.pause)
+
+        if not done:
+            self.stdout.write(f"{label}: none")
+        return done
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import json
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate the slow query log (SLOW_QUERY_LOG_FILE, or the given "
+        "files) by query fingerprint and print the top queries by total time, "
+        "with the views that ran them and their latest EXPLAIN plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*")
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the EXPLAIN plans too."
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [settings.SLOW_QUERY_LOG_FILE]
+        if not all(paths):
+            raise CommandError("SLOW_QUERY_LOG_FILE is not set; give the log files.")
+
+        queries = {}
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8") as log:
+                    for line in log:
+                        entry = self.parse(line)
+                        if entry is not None:
+                            self.add(queries, entry)
+            except OSError as e:
+                raise CommandError(f"Cannot read {path}: {e}")
+
+        ranked = sorted(queries.values(), key=lambda query: -query["total_ms"])
+        total = sum(query["total_ms"] for query in ranked)
+        self.stdout.write(
+            f"{sum(query['count'] for query in ranked)} slow queries, "
+            f"{len(ranked)} fingerprints, {total / 1000:.1f} s in total"
+        )
+        for rank, query in enumerate(ranked[: options["top"]], 1):
+            self.stdout.write(
+                f"\n#{rank} total {query['total_ms'] / 1000:.2f} s "
+                f"({query['total_ms'] / total:.0%}), count {query['count']}, "
+                f"avg {query['total_ms'] / query['count']:.0f} ms, "
+                f"max {query['max_ms']:.0f} ms"
+            )
+            self.stdout.write(f"  views: {', '.join(sorted(query['views'])) or '-'}")
+            self.stdout.write(f"  {query['fingerprint']}")
+            if options["plans"] and query["plan"]:
+                for row in query["plan"]:
+                    self.stdout.write(f"    {' '.join(map(str, row))}")
+
+    def parse(self, line):
+        # The console format prefixes the JSON object with other fields.
+        start = line.find("{")
+        if start < 0:
+            return None
+        try:
+            entry = json.loads(line[start:])
+        except ValueError:
+            return None
+        return entry if "fingerprint" in entry else None
+
+    def add(self, queries, entry):
+        query = queries.setdefault(
+            entry["fingerprint"],
+            {
+                "fingerprint": entry["fingerprint"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "views": set(),
+                "plan": None,
+            },
+        )
+        query["count"] += 1
+        query["total_ms"] += entry["duration_ms"]
+        query["max_ms"] = max(query["max_ms"], entry["duration_ms"])
+        if entry.get("view"):
+            query["views"].add(entry["view"])
+        if entry.get("plan"):
+            query["plan"] = entry["plan"]
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve
+from quizzes.hits import delete_old_path_hits, get_popular_paths
+from quizzes.views import ResponseCacheMixin
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+# The public lists, unpaginated, so one response each.
+LIST_PATHS = ["/quiz-api/tag/", "/quiz-api/quizgroup/", "/quiz-api/quiz/"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the response and JSON fragment caches after a deploy: the public "
+        "tag, quiz group and quiz lists, then the quiz and quiz group details "
+        "most requested over the last WARM_CACHE_HIT_WINDOW days according to "
+        "the hit counter, requested in parallel through the views without "
+        "throttling. Hit counts older than the window are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--details", type=int, default=settings.WARM_CACHE_DETAILS)
+        parser.add_argument("--threads", type=int, default=settings.WARM_CACHE_THREADS)
+        parser.add_argument(
+            "--host",
+            default=next(
+                (host for host in settings.ALLOWED_HOSTS if "*" not in host),
+                "localhost",
+            ),
+            help="Host of the links built into the cached responses.",
+        )
+        parser.add_argument(
+            "--secure", action="store_true", help="Build https:// links."
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(caches["default"], LocMemCache):
+            self.stderr.write(
+                "The default cache is local to each process: the workers will "
+                "not see what this command warms. Set CACHE_URL to a shared "
+                "cache."
+            )
+
+        delete_old_path_hits()
+        paths = LIST_PATHS + get_popular_paths(options["details"])
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            results = list(executor.map(lambda path: self.warm(path, options), paths))
+        elapsed = perf_counter() - started
+
+        for path, result, duration in results:
+            self.stdout.write(f"{result:<12} {duration * 1000:8.1f} ms  {path}")
+        warmed = sum(result == "200" for _, result, _ in results)
+        self.stdout.write(
+            f"\nwarmed {warmed} of {len(paths)} paths in {elapsed:.2f} s "
+            f"with {options['threads']} threads"
+        )
+
+    def warm(self, path, options):
+        """Request the path through its view; return (path, result, duration)."""
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return path, "not found", 0
+        view_class = getattr(match.func, "view_class", None)
+        if view_class is None or not issubclass(view_class, ResponseCacheMixin):
+            return path, "not cached", 0
+
+        request = RequestFactory().get(
+            path,
+            headers={"accept": "application/json", "host": options["host"]},
+            secure=options["secure"],
+        )
+        # Warming must not count as hits, nor be throttled.
+        view = view_class.as_view(throttle_classes=[], count_hits=False)
+        started = perf_counter()
+        try:
+            response = view(request, *match.args, **match.kwargs)
+            return path, str(response.status_code), perf_counter() - started
+        except Exception as e:
+            return path, type(e).__name__, perf_counter() - started
+        finally:
+            # Each thread of the pool has its own connections.
+            connections.close_all()
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+def backfill_summary(apps, schema_editor):
+    QuizGroup = apps.get_model("quizzes", "QuizGroup")
+    Tag = apps.get_model("quizzes", "Tag")
+
+    for quiz_group in QuizGroup.objects.all().iterator():
+        summary = quiz_group.quizzes.aggregate(
+            quiz_count=models.Count("id"),
+            checked_quiz_count=models.Count("id", filter=models.Q(is_checked=True)),
+            last_quiz_added_at=models.Max("created_at"),
+        )
+        summary["tag_names"] = sorted(
+            Tag.objects.filter(quizzes__related_group=quiz_group)
+            .values_list("name", flat=True)
+            .distinct()
+        )
+        QuizGroup.objects.filter(pk=quiz_group.pk).update(**summary)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizgroup',
+            name='checked_quiz_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of checked quizzes in the group.', verbose_name='Checked Quiz Count'),
+        ),
+        migrations.AddField(
+            model_name='quizgroup',
+            name='last_quiz_added_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Creation timestamp of the newest quiz in the group.', null=True, verbose_name='Last Quiz Added At'),
+        ),
+        migrations.AddField(
+            model_name='quizgroup',
+            name='quiz_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of quizzes in the group.', verbose_name='Quiz Count'),
+        ),
+        migrations.AddField(
+            model_name='quizgroup',
+            name='tag_names',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Distinct tag names used by the quizzes in the group.', verbose_name='Tag Names'),
+        ),
+        migrations.RunPython(backfill_summary, migrations.RunPython.noop),
+    ]
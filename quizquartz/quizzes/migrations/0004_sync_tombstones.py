@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:04
+
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0003_quiz_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model_name', models.CharField(help_text='Name of the model of the deleted object.', max_length=50, verbose_name='Model Name')),
+                ('object_id', models.UUIDField(help_text='ID of the deleted object.', verbose_name='Object ID')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, help_text='Deletion timestamp.', verbose_name='Deleted At')),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+            },
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, help_text='Creation timestamp.', verbose_name='Created At'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Last update timestamp.', verbose_name='Updated At'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['updated_at'], name='quiz_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizgroup',
+            index=models.Index(fields=['updated_at'], name='quizgroup_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['updated_at'], name='tag_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0004_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Soft deletion timestamp. The row is purged later.', null=True, verbose_name='Deleted At'),
+        ),
+        migrations.AddField(
+            model_name='quizgroup',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Soft deletion timestamp. The row is purged later.', null=True, verbose_name='Deleted At'),
+        ),
+    ]
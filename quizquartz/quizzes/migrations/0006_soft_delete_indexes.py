@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0005_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['deleted_at'], name='quiz_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizgroup',
+            index=models.Index(fields=['-created_at'], name='quizgroup_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizgroup',
+            index=models.Index(fields=['deleted_at'], name='quizgroup_deleted_at_idx'),
+        ),
+    ]
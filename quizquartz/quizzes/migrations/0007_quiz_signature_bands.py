@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0006_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField(help_text='Index of the band in the signature.', verbose_name='Band')),
+                ('bucket', models.BigIntegerField(help_text='Hash of the signature values in the band.', verbose_name='Bucket')),
+                ('quiz', models.ForeignKey(help_text='The quiz whose question the signature describes.', on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='quizzes.quiz', verbose_name='Quiz')),
+            ],
+            options={
+                'verbose_name': 'Quiz Signature Band',
+                'verbose_name_plural': 'Quiz Signature Bands',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='quizband_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('quiz', 'band'), name='quizband_quiz_band_uniq')],
+            },
+        ),
+    ]
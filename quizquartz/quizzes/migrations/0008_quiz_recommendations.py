@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0007_quiz_signature_bands'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizRecommendation',
+            fields=[
+                ('quiz', models.OneToOneField(help_text='The quiz the recommendations are for.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommendation', serialize=False, to='quizzes.quiz', verbose_name='Quiz')),
+                ('related_ids', models.JSONField(default=list, help_text='IDs of the related quizzes, best first.', verbose_name='Related IDs')),
+                ('computed_at', models.DateTimeField(help_text='Start of the build that computed the recommendations.', verbose_name='Computed At')),
+            ],
+            options={
+                'verbose_name': 'Quiz Recommendation',
+                'verbose_name_plural': 'Quiz Recommendations',
+                'indexes': [models.Index(fields=['computed_at'], name='recommendation_computed_idx')],
+            },
+        ),
+    ]
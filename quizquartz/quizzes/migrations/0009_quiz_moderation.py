@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0008_quiz_recommendations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Reviewer holding the quiz in the moderation queue.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_quizzes', to=settings.AUTH_USER_MODEL, verbose_name='Claimed By'),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, editable=False, help_text="End of the reviewer's lease on the quiz.", null=True, verbose_name='Claimed Until'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['is_checked', 'deleted_at', 'created_at'], name='quiz_moderation_idx'),
+        ),
+    ]
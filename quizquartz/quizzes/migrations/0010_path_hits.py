@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0009_quiz_moderation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PathHit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Requested path, without the query string.', max_length=200, unique=True, verbose_name='Path')),
+                ('hits', models.PositiveBigIntegerField(default=0, help_text='Number of successful GET requests of the path.', verbose_name='Hits')),
+                ('last_hit_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp of the last counted batch of requests.', verbose_name='Last Hit At')),
+            ],
+            options={
+                'verbose_name': 'Path Hit',
+                'verbose_name_plural': 'Path Hits',
+                'indexes': [models.Index(fields=['-hits'], name='pathhit_hits_idx')],
+            },
+        ),
+    ]
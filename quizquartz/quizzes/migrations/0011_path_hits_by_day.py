@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def delete_path_hits(apps, schema_editor):
+    # All-time counts cannot be split into days; the counter refills the days.
+    apps.get_model("quizzes", "PathHit").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0010_path_hits'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_path_hits, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='pathhit',
+            name='pathhit_hits_idx',
+        ),
+        migrations.RemoveField(
+            model_name='pathhit',
+            name='last_hit_at',
+        ),
+        migrations.AddField(
+            model_name='pathhit',
+            name='day',
+            field=models.DateField(default=django.utils.timezone.localdate, help_text='Day the requests were counted on.', verbose_name='Day'),
+        ),
+        migrations.AlterField(
+            model_name='pathhit',
+            name='hits',
+            field=models.PositiveBigIntegerField(default=0, help_text='Number of successful GET requests of the path on the day.', verbose_name='Hits'),
+        ),
+        migrations.AlterField(
+            model_name='pathhit',
+            name='path',
+            field=models.CharField(help_text='Requested path, without the query string.', max_length=200, verbose_name='Path'),
+        ),
+        migrations.AddIndex(
+            model_name='pathhit',
+            index=models.Index(fields=['day'], name='pathhit_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='pathhit',
+            constraint=models.UniqueConstraint(fields=('path', 'day'), name='pathhit_path_day_uniq'),
+        ),
+    ]
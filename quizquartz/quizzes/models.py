@@ -1,8 +1,19 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from accounts.models import User
+from .response_cache import bump_response_cache_version
 from uuid import uuid4
 
+NOT_DELETED = models.Q(deleted_at__isnull=True)
+
+
+class NotDeletedManager(models.Manager):
+    """Manager hiding soft-deleted rows (those with a deleted_at)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(NOT_DELETED)
+
 
 class Tag(models.Model):
     """Model representing a tag for quizzes."""
@@ -23,10 +34,21 @@ class Tag(models.Model):
         verbose_name=_("Is Private"),
         help_text=_("Indicates whether the tag is private."),
     )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Created At"),
+        help_text=_("Creation timestamp."),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At"),
+        help_text=_("Last update timestamp."),
+    )
 
     class Meta:
         verbose_name = _("Tag")
         verbose_name_plural = _("Tags")
+        indexes = [models.Index(fields=["updated_at"], name="tag_updated_at_idx")]
 
     def __str__(self):
         return self.name
@@ -79,14 +101,99 @@ class QuizGroup(models.Model):
         verbose_name=_("Updated At"),
         help_text=_("Last update timestamp."),
     )
+    # Denormalized summary of the group's quizzes, maintained by the quiz views.
+    quiz_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Quiz Count"),
+        help_text=_("Number of quizzes in the group."),
+    )
+    checked_quiz_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Checked Quiz Count"),
+        help_text=_("Number of checked quizzes in the group."),
+    )
+    last_quiz_added_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Last Quiz Added At"),
+        help_text=_("Creation timestamp of the newest quiz in the group."),
+    )
+    tag_names = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name=_("Tag Names"),
+        help_text=_("Distinct tag names used by the quizzes in the group."),
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Deleted At"),
+        help_text=_("Soft deletion timestamp. The row is purged later."),
+    )
+
+    # The default manager hides soft-deleted groups.
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = _("Quiz Group")
         verbose_name_plural = _("Quiz Groups")
+        # Plain rather than partial (condition=NOT_DELETED) indexes, as MySQL
+        # does not create conditional indexes at all.
+        indexes = [
+            models.Index(fields=["-created_at"], name="quizgroup_created_at_idx"),
+            models.Index(fields=["updated_at"], name="quizgroup_updated_at_idx"),
+            models.Index(fields=["deleted_at"], name="quizgroup_deleted_at_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def refresh_summary(self):
+        """Recompute the summary fields from the group's quizzes.
+
+        Must be called inside a transaction. The group row is locked first so
+        that concurrent writers to the same group recompute one after another.
+        """
+        list(QuizGroup.objects.select_for_update().filter(pk=self.pk).values("pk"))
+        summary = self.quizzes.aggregate(
+            quiz_count=models.Count("id"),
+            checked_quiz_count=models.Count("id", filter=models.Q(is_checked=True)),
+            last_quiz_added_at=models.Max("created_at"),
+        )
+        summary["tag_names"] = sorted(
+            Tag.objects.filter(
+                quizzes__related_group=self, quizzes__deleted_at__isnull=True
+            )
+            .values_list("name", flat=True)
+            .distinct()
+        )
+        summary["updated_at"] = timezone.now()
+        QuizGroup.objects.filter(pk=self.pk).update(**summary)
+        for field, value in summary.items():
+            setattr(self, field, value)
+
+    def soft_delete(self):
+        """Hide the group with a single-row update.
+
+        Its quizzes stay attached and are shown without a group until the
+        purge_deleted command detaches them in batches and removes the row.
+        The unique title is released right away so it can be reused.
+        """
+        now = timezone.now()
+        title = f"deleted-{self.pk.hex}"
+        QuizGroup.objects.filter(pk=self.pk).update(
+            title=title, deleted_at=now, updated_at=now
+        )
+        self.title = title
+        self.deleted_at = self.updated_at = now
+        bump_response_cache_version()
+
 
 class Quiz(models.Model):
     """Model representing a quiz."""
@@ -145,10 +252,198 @@ class Quiz(models.Model):
         verbose_name=_("Updated At"),
         help_text=_("Last update timestamp."),
     )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Deleted At"),
+        help_text=_("Soft deletion timestamp. The row is purged later."),
+    )
+    claimed_by = models.ForeignKey(
+        to=User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="claimed_quizzes",
+        verbose_name=_("Claimed By"),
+        help_text=_("Reviewer holding the quiz in the moderation queue."),
+    )
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Claimed Until"),
+        help_text=_("End of the reviewer's lease on the quiz."),
+    )
+
+    # The default manager hides soft-deleted quizzes.
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = _("Quiz")
         verbose_name_plural = _("Quizzes")
+        # Composite indexes serve the quiz list filters with its default ordering.
+        # They are plain like those of QuizGroup.
+        indexes = [
+            models.Index(fields=["-created_at"], name="quiz_created_at_idx"),
+            models.Index(
+                fields=["is_checked", "-created_at"], name="quiz_checked_created_idx"
+            ),
+            models.Index(
+                fields=["related_group", "-created_at"], name="quiz_group_created_idx"
+            ),
+            models.Index(
+                fields=["created_by", "-created_at"], name="quiz_author_created_idx"
+            ),
+            models.Index(fields=["updated_at"], name="quiz_updated_at_idx"),
+            models.Index(fields=["deleted_at"], name="quiz_deleted_at_idx"),
+            # The moderation queue: unchecked quizzes not deleted, oldest first.
+            models.Index(
+                fields=["is_checked", "deleted_at", "created_at"],
+                name="quiz_moderation_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.question
+
+    def soft_delete(self):
+        """Hide the quiz with a single-row update; purge_deleted removes it later."""
+        now = timezone.now()
+        Quiz.objects.filter(pk=self.pk).update(deleted_at=now, updated_at=now)
+        self.deleted_at = self.updated_at = now
+        bump_response_cache_version()
+
+
+class QuizSignatureBand(models.Model):
+    """Model storing one LSH band bucket of a quiz question's MinHash signature."""
+
+    quiz = models.ForeignKey(
+        to=Quiz,
+        on_delete=models.CASCADE,
+        related_name="signature_bands",
+        verbose_name=_("Quiz"),
+        help_text=_("The quiz whose question the signature describes."),
+    )
+    band = models.PositiveSmallIntegerField(
+        verbose_name=_("Band"),
+        help_text=_("Index of the band in the signature."),
+    )
+    bucket = models.BigIntegerField(
+        verbose_name=_("Bucket"),
+        help_text=_("Hash of the signature values in the band."),
+    )
+
+    class Meta:
+        verbose_name = _("Quiz Signature Band")
+        verbose_name_plural = _("Quiz Signature Bands")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["quiz", "band"], name="quizband_quiz_band_uniq"
+            )
+        ]
+        indexes = [models.Index(fields=["band", "bucket"], name="quizband_bucket_idx")]
+
+    def __str__(self):
+        return f"{self.quiz_id}:{self.band}:{self.bucket}"
+
+
+class QuizRecommendation(models.Model):
+    """Model storing the precomputed related quizzes of a quiz."""
+
+    quiz = models.OneToOneField(
+        to=Quiz,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="recommendation",
+        verbose_name=_("Quiz"),
+        help_text=_("The quiz the recommendations are for."),
+    )
+    related_ids = models.JSONField(
+        default=list,
+        verbose_name=_("Related IDs"),
+        help_text=_("IDs of the related quizzes, best first."),
+    )
+    computed_at = models.DateTimeField(
+        verbose_name=_("Computed At"),
+        help_text=_("Start of the build that computed the recommendations."),
+    )
+
+    class Meta:
+        verbose_name = _("Quiz Recommendation")
+        verbose_name_plural = _("Quiz Recommendations")
+        indexes = [
+            models.Index(fields=["computed_at"], name="recommendation_computed_idx")
+        ]
+
+    def __str__(self):
+        return str(self.quiz_id)
+
+
+class Tombstone(models.Model):
+    """Model recording a deleted tag, quiz group or quiz for delta sync."""
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    model_name = models.CharField(
+        verbose_name=_("Model Name"),
+        max_length=50,
+        help_text=_("Name of the model of the deleted object."),
+    )
+    object_id = models.UUIDField(
+        verbose_name=_("Object ID"),
+        help_text=_("ID of the deleted object."),
+    )
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Deleted At"),
+        help_text=_("Deletion timestamp."),
+    )
+
+    class Meta:
+        verbose_name = _("Tombstone")
+        verbose_name_plural = _("Tombstones")
+        indexes = [
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.model_name}:{self.object_id}"
+
+
+class PathHit(models.Model):
+    """Model counting the requests of a quiz API detail path on one day.
+
+    Written in batches by ``quizzes.hits``; the paths most requested over the
+    last days are warmed by the warm_cache command.
+    """
+
+    path = models.CharField(
+        verbose_name=_("Path"),
+        max_length=200,
+        help_text=_("Requested path, without the query string."),
+    )
+    day = models.DateField(
+        default=timezone.localdate,
+        verbose_name=_("Day"),
+        help_text=_("Day the requests were counted on."),
+    )
+    hits = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_("Hits"),
+        help_text=_("Number of successful GET requests of the path on the day."),
+    )
+
+    class Meta:
+        verbose_name = _("Path Hit")
+        verbose_name_plural = _("Path Hits")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["path", "day"], name="pathhit_path_day_uniq"
+            )
+        ]
+        indexes = [models.Index(fields=["day"], name="pathhit_day_idx")]
+
+    def __str__(self):
+        return self.path
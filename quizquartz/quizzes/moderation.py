@@ -0,0 +1,102 @@
+"""Moderation queue of unchecked quizzes.
+
+Reviewers claim batches of live unchecked quizzes, oldest first, for
+``MODERATION_LEASE_SECONDS``. A claim is a lease stored on the quiz
+(``claimed_by`` and ``claimed_until``), so it outlives the request and
+expires by itself when a reviewer goes away. Backends with ``SKIP LOCKED``
+pick candidates with ``select_for_update(skip_locked=True)``, so concurrent
+reviewers never wait for nor get the same rows. Elsewhere (SQLite), a
+conditional UPDATE takes the lease only on rows still free, and since SQLite
+serializes writers, each quiz goes to one reviewer.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import QuizGroup, Quiz
+from .response_cache import bump_response_cache_version
+from datetime import timedelta
+
+
+def get_queue():
+    """Return the live unchecked quizzes, oldest first (``quiz_moderation_idx``)."""
+    return Quiz.objects.filter(is_checked=False).order_by("created_at")
+
+
+def select_pks(queryset, limit):
+    """Return the pks of the first ``limit`` rows, as a list or a subquery.
+
+    With ``SKIP LOCKED`` the rows are locked and rows locked by concurrent
+    claims are skipped. Otherwise the pks stay a subquery, so that the UPDATE
+    using them reads and writes in one statement: on SQLite a transaction
+    starting with a read can fail to upgrade to a write under contention.
+    """
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+        return list(queryset.values_list("pk", flat=True)[:limit])
+    return queryset.values("pk")[:limit]
+
+
+def claim_quizzes(user, count):
+    """Lease up to ``count`` unclaimed quizzes to the user and return them.
+
+    Quizzes the user already holds are renewed and returned first.
+    """
+    now = timezone.now()
+    lease = {
+        "claimed_by": user,
+        "claimed_until": now + timedelta(seconds=settings.MODERATION_LEASE_SECONDS),
+    }
+    free = Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+
+    with transaction.atomic():
+        held = get_queue().filter(claimed_by=user, claimed_until__gte=now)
+        renewed = Quiz.objects.filter(pk__in=select_pks(held, count)).update(**lease)
+        if renewed < count:
+            # The condition is checked again by the UPDATE itself: a row leased
+            # since it was read is left alone.
+            candidates = select_pks(get_queue().filter(free), count - renewed)
+            Quiz.objects.filter(free, pk__in=candidates, is_checked=False).update(
+                **lease
+            )
+
+    return list(
+        get_queue()
+        .filter(claimed_by=user, claimed_until=lease["claimed_until"])
+        .select_related("related_group", "created_by")
+        .prefetch_related("tags")
+    )
+
+
+def review_quizzes(user, approve=(), reject=()):
+    """Approve or reject quizzes leased to the user; return the counts.
+
+    Approved quizzes are marked as checked and rejected ones soft-deleted, each
+    with a single UPDATE. Quizzes whose lease the user no longer holds are
+    skipped.
+    """
+    now = timezone.now()
+    released = {"claimed_by": None, "claimed_until": None, "updated_at": now}
+
+    with transaction.atomic():
+        held = get_queue().filter(claimed_by=user, claimed_until__gte=now)
+        approved = held.filter(pk__in=approve).update(is_checked=True, **released)
+        rejected = held.filter(pk__in=reject).update(deleted_at=now, **released)
+        # Read after writing, for SQLite (see select_pks). The reviewed rows are
+        # the ones just stamped with this updated_at.
+        group_pks = (
+            Quiz.all_objects.filter(
+                pk__in=[*approve, *reject],
+                updated_at=now,
+                related_group__isnull=False,
+            )
+            .values_list("related_group_id", flat=True)
+            .distinct()
+        )
+        for quiz_group in QuizGroup.objects.filter(pk__in=list(group_pks)):
+            quiz_group.refresh_summary()
+
+    if approved or rejected:
+        bump_response_cache_version()
+    return approved, rejected
@@ -0,0 +1,168 @@
+"""Related-quiz recommendations from tag and group co-occurrence.
+
+The tag x quiz incidence matrix (``Quiz.tags.through``) is held as sparse
+posting lists, one per tag, with groups treated as one more kind of column.
+A quiz's neighbours are the quizzes sharing columns with it, scored by the
+sum of the weights of the shared columns. A column's weight is lower the more
+quizzes it has (like IDF), and columns with more than
+``RECOMMENDATION_MAX_POSTING`` quizzes are skipped altogether, since they say
+little and would make scoring quadratic.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Quiz, QuizRecommendation
+from collections import defaultdict
+from heapq import nlargest
+from operator import itemgetter
+import math
+
+# Primary keys per IN (...) clause, below every backend's parameter limit.
+CHUNK_SIZE = 500
+
+
+def chunked(values):
+    values = list(values)
+    for start in range(0, len(values), CHUNK_SIZE):
+        yield values[start : start + CHUNK_SIZE]
+
+
+class CooccurrenceMatrix:
+    """Sparse quiz x column matrix, held as columns per quiz and posting lists."""
+
+    def __init__(self):
+        self.quiz_columns = defaultdict(list)
+        self.postings = defaultdict(list)
+
+    def add(self, quiz_pk, column):
+        self.quiz_columns[quiz_pk].append(column)
+        self.postings[column].append(quiz_pk)
+
+    @classmethod
+    def load(cls, quiz_pks=None):
+        """Load the matrix over live quizzes.
+
+        If quiz_pks is given, only the columns of those quizzes are loaded.
+        That is enough to score them exactly, since a quiz's score only reads
+        the posting lists of its own columns.
+        """
+        through = Quiz.tags.through.objects.filter(quiz__deleted_at__isnull=True)
+        grouped = Quiz.objects.filter(
+            related_group__isnull=False, related_group__deleted_at__isnull=True
+        )
+        if quiz_pks is None:
+            through_chunks = [through]
+            grouped_chunks = [grouped]
+        else:
+            tag_pks, group_pks = set(), set()
+            for chunk in chunked(quiz_pks):
+                tag_pks.update(
+                    Quiz.tags.through.objects.filter(quiz_id__in=chunk).values_list(
+                        "tag_id", flat=True
+                    )
+                )
+                group_pks.update(
+                    Quiz.all_objects.filter(
+                        pk__in=chunk, related_group__isnull=False
+                    ).values_list("related_group_id", flat=True)
+                )
+            through_chunks = [
+                through.filter(tag_id__in=chunk) for chunk in chunked(tag_pks)
+            ]
+            grouped_chunks = [
+                grouped.filter(related_group_id__in=chunk)
+                for chunk in chunked(group_pks)
+            ]
+
+        matrix = cls()
+        for queryset in through_chunks:
+            for quiz_pk, tag_pk in queryset.values_list("quiz_id", "tag_id"):
+                matrix.add(quiz_pk, ("tag", tag_pk))
+        for queryset in grouped_chunks:
+            for quiz_pk, group_pk in queryset.values_list("pk", "related_group_id"):
+                matrix.add(quiz_pk, ("group", group_pk))
+        return matrix
+
+    def get_related(self, quiz_pk, count):
+        """Return the pks of the quiz's top ``count`` neighbours, best first."""
+        scores = defaultdict(float)
+        for column in self.quiz_columns.get(quiz_pk, ()):
+            posting = self.postings[column]
+            if len(posting) > settings.RECOMMENDATION_MAX_POSTING:
+                continue
+            weight = 1 / math.log(1 + len(posting))
+            for other in posting:
+                scores[other] += weight
+        scores.pop(quiz_pk, None)
+        return [pk for pk, _ in nlargest(count, scores.items(), key=itemgetter(1))]
+
+
+def get_last_build():
+    return (
+        QuizRecommendation.objects.order_by("-computed_at")
+        .values_list("computed_at", flat=True)
+        .first()
+    )
+
+
+def get_stale_quizzes(since):
+    """Return the pks of the live quizzes whose recommendations may be stale.
+
+    Those are the quizzes changed since the last build or without
+    recommendations, and every quiz sharing a tag or group with a quiz
+    changed or deleted since then.
+    """
+    changed = set(
+        Quiz.all_objects.filter(
+            Q(updated_at__gt=since) | Q(deleted_at__gt=since)
+        ).values_list("pk", flat=True)
+    )
+    changed.update(
+        Quiz.objects.filter(recommendation__isnull=True).values_list("pk", flat=True)
+    )
+
+    stale = set(CooccurrenceMatrix.load(changed).quiz_columns)
+    for chunk in chunked(changed - stale):
+        # Live quizzes without tags or group, whose recommendations are empty.
+        stale.update(Quiz.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+    return stale
+
+
+def build_recommendations(full=False):
+    """Recompute and store recommendations; return the number of quizzes done.
+
+    Incremental unless ``full`` is set or nothing was built yet.
+    """
+    started = timezone.now()
+    last_build = None if full else get_last_build()
+    count = settings.RECOMMENDATION_COUNT
+
+    if last_build is None:
+        quiz_pks = Quiz.objects.values_list("pk", flat=True)
+        matrix = CooccurrenceMatrix.load()
+    else:
+        quiz_pks = get_stale_quizzes(last_build)
+        matrix = CooccurrenceMatrix.load(quiz_pks)
+
+    built = 0
+    for chunk in chunked(quiz_pks):
+        with transaction.atomic():
+            QuizRecommendation.objects.bulk_create(
+                [
+                    QuizRecommendation(
+                        quiz_id=quiz_pk,
+                        related_ids=[
+                            str(pk) for pk in matrix.get_related(quiz_pk, count)
+                        ],
+                        computed_at=started,
+                    )
+                    for quiz_pk in chunk
+                ],
+                update_conflicts=True,
+                unique_fields=["quiz"],
+                update_fields=["related_ids", "computed_at"],
+            )
+        built += len(chunk)
+    return built
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from quizquartz.compression import compress_variants
+from hashlib import md5
+from time import time_ns
+
+RESPONSE_CACHE_VERSION_KEY = "quizzes:response_cache_version"
+
+
+def get_response_cache_version():
+    return cache.get_or_set(RESPONSE_CACHE_VERSION_KEY, time_ns, timeout=None)
+
+
+def bump_response_cache_version():
+    """Invalidate every cached response at once."""
+    cache.set(RESPONSE_CACHE_VERSION_KEY, time_ns(), timeout=None)
+
+
+def make_response_cache_key(request):
+    path_digest = md5(request.get_full_path().encode()).hexdigest()
+    return (
+        f"quizzes:response:{get_response_cache_version()}:{path_digest}:"
+        f"{request.accepted_media_type}"
+    )
+
+
+def make_object_cache_key(model, pk, field_names, version):
+    """Key of one serialized object, dropped with the cached responses.
+
+    ``version`` is the response cache version, read once per request.
+    """
+    fields_digest = md5(",".join(field_names).encode()).hexdigest()[:12]
+    return f"quizzes:object:{version}:{model._meta.model_name}:{pk}:{fields_digest}"
+
+
+def make_cache_entry(response):
+    """Build a cache entry holding the body and its compressed variants."""
+    content = response.content
+    return {
+        "content": content,
+        "content_type": response["Content-Type"],
+        "precompressed": (
+            compress_variants(content)
+            if len(content) >= settings.COMPRESSION_MIN_SIZE
+            else {}
+        ),
+    }
+
+
+def build_cached_response(entry):
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    response.precompressed = entry["precompressed"]
+    return response
@@ -1,11 +1,112 @@
 from rest_framework import serializers
+from rest_framework.fields import SkipField, get_attribute
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from quizquartz.uniqueness import UniqueFieldsMixin
 from .models import Tag, QuizGroup, Quiz
 
-
 User = get_user_model()
 
 
+class SparseFieldsetMixin:
+    """Let clients select the serialized fields through query parameters.
+
+    ``?fields=a,b`` keeps only the given fields, ``?omit=a,b`` drops them and
+    ``?fields=summary`` selects ``Meta.summary_fields``. The same selection is
+    pushed down into the queryset by ``optimize_queryset`` so unneeded columns
+    and joins are never fetched.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+
+        if request is not None:
+            selected = self.get_selected_fields(request.query_params)
+            for field_name in set(self.fields) - set(selected):
+                self.fields.pop(field_name)
+
+    @classmethod
+    def get_selected_fields(cls, params):
+        field_names = list(cls.Meta.fields)
+        requested = params.get("fields")
+
+        if requested == "summary":
+            field_names = list(cls.Meta.summary_fields)
+        elif requested:
+            requested_names = set(requested.split(","))
+            field_names = [name for name in field_names if name in requested_names]
+
+        omit = params.get("omit")
+        if omit:
+            omitted_names = set(omit.split(","))
+            field_names = [name for name in field_names if name not in omitted_names]
+
+        return field_names
+
+    @classmethod
+    def optimize_queryset(cls, queryset, params):
+        """Restrict the queryset to the columns and joins of the selected fields."""
+        fields = cls().fields
+        columns = ["pk"]
+        select_related = []
+        prefetch_related = []
+
+        for field_name in cls.get_selected_fields(params):
+            field = fields[field_name]
+            if isinstance(field, serializers.ManyRelatedField):
+                model_field = queryset.model._meta.get_field(field.source)
+                slug_field = field.child_relation.slug_field
+                # Ordered like FastListSerializer, whose output must match.
+                prefetch_related.append(
+                    Prefetch(
+                        field.source,
+                        queryset=model_field.related_model.objects.only(
+                            "pk", slug_field
+                        ).order_by(slug_field),
+                    )
+                )
+            elif "." in field.source:
+                relation, attribute = field.source.rsplit(".", 1)
+                relation = relation.replace(".", "__")
+                select_related.append(relation)
+                columns.append(f"{relation}__{attribute}")
+                if getattr(field, "deleted_source", None):
+                    columns.append(field.deleted_source.replace(".", "__"))
+            else:
+                columns.append(field.source)
+
+        queryset = queryset.only(*columns)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class NotDeletedRelatedField(serializers.CharField):
+    """Read-only CharField with a dotted source through a soft-deletable relation.
+
+    A soft-deleted related object is skipped like a missing one, the way DRF
+    skips a dotted source through a null relation.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    @property
+    def deleted_source(self):
+        return f"{self.source.rsplit('.', 1)[0]}.deleted_at"
+
+    def get_attribute(self, instance):
+        related = get_attribute(instance, self.source_attrs[:-1])
+        if related is not None and related.deleted_at is not None:
+            raise SkipField()
+        return super().get_attribute(instance)
+
+
 class TagSerializer(serializers.ModelSerializer):
     """Serializer for listing tags."""
 
@@ -14,17 +115,28 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ("id", "name")
 
 
-class QuizGroupSerializer(serializers.ModelSerializer):
+class QuizGroupSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for listing quiz groups."""
 
     created_by = serializers.CharField(source="created_by.nickname", read_only=True)
 
     class Meta:
         model = QuizGroup
-        fields = ("id", "title", "subtitle", "description", "created_by")
+        fields = (
+            "id",
+            "title",
+            "subtitle",
+            "description",
+            "created_by",
+            "quiz_count",
+            "checked_quiz_count",
+            "last_quiz_added_at",
+            "tag_names",
+        )
+        summary_fields = ("id", "title", "created_by", "quiz_count")
 
 
-class QuizGroupCreateSerializer(serializers.ModelSerializer):
+class QuizGroupCreateSerializer(UniqueFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating quiz groups."""
 
     title = serializers.CharField(max_length=100)
@@ -37,19 +149,21 @@ class QuizGroupCreateSerializer(serializers.ModelSerializer):
         model = QuizGroup
         fields = ("title", "subtitle", "description")
 
+    unique_error_messages = {"title": "このタイトル名は別ユーザーが使用しています。"}
+
     def validate(self, data):
-        title = data.get("title")
-        if QuizGroup.objects.filter(title=title).exists():
-            raise serializers.ValidationError(
-                detail="このタイトル名は別ユーザーが使用しています。"
-            )
+        if "title" in self.get_taken_fields(data):
+            raise self.unique_error("title", data.get("title"))
+        return data
 
     def create(self, validated_data):
-        quiz_group = QuizGroup.objects.create(**validated_data)
+        quiz_group = self.save_unique(
+            lambda: QuizGroup.objects.create(**validated_data)
+        )
         return quiz_group
 
 
-class QuizGroupUpdateSerializer(serializers.ModelSerializer):
+class QuizGroupUpdateSerializer(UniqueFieldsMixin, serializers.ModelSerializer):
     """Serializer for updating quiz groups."""
 
     title = serializers.CharField(max_length=100)
@@ -62,28 +176,27 @@ class QuizGroupUpdateSerializer(serializers.ModelSerializer):
         model = QuizGroup
         fields = ("title", "subtitle", "description")
 
+    unique_error_messages = {"title": "このタイトル名は別ユーザーが使用しています。"}
+
     def validate(self, data):
-        title = data.get("title")
-        instance = self.instance
-        if QuizGroup.objects.filter(title=title).exclude(id=instance.id).exists():
-            raise serializers.ValidationError(
-                detail="このタイトル名は別ユーザーが使用しています。"
-            )
+        if "title" in self.get_taken_fields(data):
+            raise self.unique_error("title", data.get("title"))
         return data
 
     def update(self, instance, validated_data):
         instance.title = validated_data.get("title", instance.title)
         instance.subtitle = validated_data.get("subtitle", instance.subtitle)
         instance.description = validated_data.get("description", instance.description)
-        instance.save()
+        self.save_unique(instance.save)
         return instance
 
 
-class QuizSerializer(serializers.ModelSerializer):
+class QuizSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for listing quizzes."""
 
     tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field="name")
-    related_group = serializers.CharField(source="related_group.title", read_only=True)
+    # Quizzes stay attached to a deleted group until purge_deleted runs.
+    related_group = NotDeletedRelatedField(source="related_group.title")
     created_by = serializers.CharField(source="created_by.nickname", read_only=True)
 
     class Meta:
@@ -97,6 +210,7 @@ class QuizSerializer(serializers.ModelSerializer):
             "related_group",
             "created_by",
         )
+        summary_fields = ("id", "question", "is_checked", "related_group")
 
 
 class QuizCreateSerializer(serializers.ModelSerializer):
@@ -177,3 +291,37 @@ class QuizUpdateSerializer(serializers.ModelSerializer):
 
         instance.save()
         return instance
+
+
+class QuizClaimSerializer(serializers.Serializer):
+    """Serializer for claiming quizzes from the moderation queue."""
+
+    count = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_count(self, value):
+        if value > settings.MODERATION_BATCH_SIZE:
+            raise serializers.ValidationError(
+                detail=f"一度に確保できるのは{settings.MODERATION_BATCH_SIZE}件までです。"
+            )
+        return value
+
+
+class QuizReviewSerializer(serializers.Serializer):
+    """Serializer for approving and rejecting claimed quizzes."""
+
+    approve = serializers.ListField(child=serializers.UUIDField(), required=False)
+    reject = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    def validate(self, data):
+        ids = [*data.get("approve", []), *data.get("reject", [])]
+
+        if not ids:
+            raise serializers.ValidationError(
+                detail="承認または却下するクイズを指定してください。"
+            )
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError(
+                detail="同じクイズが複数回指定されています。"
+            )
+
+        return data
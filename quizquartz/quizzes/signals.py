@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Tag, QuizGroup, Quiz, Tombstone
+from .response_cache import bump_response_cache_version
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=QuizGroup)
+@receiver(post_delete, sender=QuizGroup)
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Quiz.tags.through)
+def invalidate_response_cache(sender, **kwargs):
+    """Drop cached API responses whenever data shown by the quiz API changes."""
+    bump_response_cache_version()
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=QuizGroup)
+@receiver(post_delete, sender=Quiz)
+def record_tombstone(sender, instance, **kwargs):
+    """Remember deleted objects so delta sync clients can drop them."""
+    Tombstone.objects.create(model_name=sender._meta.model_name, object_id=instance.pk)
+
+
+# The receivers below bump updated_at on objects whose serialized form embeds
+# data of the saved object, so delta sync and the fragment cache pick them up.
+
+
+@receiver(post_save, sender=Tag)
+def touch_tagged_objects(sender, instance, created, **kwargs):
+    if created:
+        return
+    Quiz.objects.filter(tags=instance).update(updated_at=timezone.now())
+    with transaction.atomic():
+        for quiz_group in QuizGroup.objects.filter(quizzes__tags=instance).distinct():
+            quiz_group.refresh_summary()
+
+
+@receiver(post_save, sender=QuizGroup)
+def touch_group_quizzes(sender, instance, created, **kwargs):
+    if not created:
+        instance.quizzes.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=QuizGroup)
+def touch_detached_quizzes(sender, instance, **kwargs):
+    # The quizzes lose their group through SET_NULL, which skips auto_now.
+    instance.quizzes.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def touch_authored_objects(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields is not None and "nickname" not in update_fields):
+        return
+    now = timezone.now()
+    instance.quizzes.update(updated_at=now)
+    instance.quiz_groups.update(updated_at=now)
+    bump_response_cache_version()
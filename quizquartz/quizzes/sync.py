@@ -0,0 +1,17 @@
+from datetime import datetime, timedelta, timezone
+from rest_framework.exceptions import ParseError
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_watermark(moment):
+    """Encode a datetime as an opaque watermark token (microseconds since epoch)."""
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_watermark(token):
+    try:
+        return EPOCH + timedelta(microseconds=int(token))
+    except (TypeError, ValueError, OverflowError):
+        raise ParseError(detail={"error": "無効な同期トークンです。"})
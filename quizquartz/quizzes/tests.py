@@ -1,3 +1,371 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from .filters import QuizFilterBackend
+from .moderation import claim_quizzes, review_quizzes
+from .models import Quiz, QuizGroup, Tag, Tombstone
+from .sync import encode_watermark
+from datetime import timedelta
+from io import StringIO
+from uuid import uuid4
 
-# Create your tests here.
+
+class QuizFilterIndexTests(TestCase):
+    """Each filter combination of the quiz list is served by a list index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            get_user_model().objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="x",
+                nickname=f"user{i}",
+            )
+            for i in range(20)
+        ]
+        cls.group = QuizGroup.objects.create(title="group", created_by=users[0])
+        groups = [cls.group] + [
+            QuizGroup.objects.create(title=f"group{i}", created_by=users[i])
+            for i in range(1, 20)
+        ]
+        tags = [Tag.objects.create(name=f"tag{i}") for i in range(10)]
+
+        now = timezone.now()
+        quizzes = Quiz.objects.bulk_create(
+            Quiz(
+                question=f"question {i}",
+                answer=["answer"],
+                related_group=groups[i % len(groups)],
+                is_checked=i % 10 == 0,
+                created_by=users[i % len(users)],
+                deleted_at=now if i % 50 == 0 else None,
+            )
+            for i in range(1000)
+        )
+        Quiz.tags.through.objects.bulk_create(
+            Quiz.tags.through(quiz=quiz, tag=tags[i % len(tags)])
+            for i, quiz in enumerate(quizzes)
+        )
+        # Let the planner pick indexes from the statistics, as in production.
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                tables = [Quiz._meta.db_table, Quiz.tags.through._meta.db_table]
+                cursor.execute(f"ANALYZE TABLE {', '.join(tables)}")
+            else:
+                cursor.execute("ANALYZE")
+
+    def get_plan(self, query_string):
+        request = Request(
+            RequestFactory().get("/quiz-api/quiz/", QUERY_STRING=query_string)
+        )
+        queryset = QuizFilterBackend().filter_queryset(
+            request, Quiz.objects.all().order_by("-created_at"), None
+        )
+        return queryset.explain()
+
+    def test_filters_use_indexes(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        # Without histograms (SQLite's STAT4), a boolean column looks as if
+        # each value matched half the rows, so the planner may rather walk the
+        # created_at index, which needs no sort either.
+        checked = ("quiz_checked_created_idx", "quiz_created_at_idx")
+        cases = [
+            ("", ("quiz_created_at_idx",)),
+            ("is_checked=true", checked),
+            (f"group={self.group.pk}", ("quiz_group_created_idx",)),
+            ("created_by=user1", ("quiz_author_created_idx",)),
+            (f"created_after={since}", ("quiz_created_at_idx",)),
+            (f"is_checked=true&created_after={since}", checked),
+            (f"group={self.group.pk}&is_checked=true", ("quiz_group_created_idx",)),
+            ("created_by=user1&is_checked=true", ("quiz_author_created_idx",)),
+            # Tags are matched by a subquery on the through table's indexes.
+            ("tag=tag1", ("quizzes_quiz_tags_",)),
+            ("tag=tag1,tag2&tag_mode=any", ("quizzes_quiz_tags_",)),
+        ]
+        for query_string, indexes in cases:
+            with self.subTest(query_string):
+                plan = self.get_plan(query_string)
+                self.assertTrue(any(index in plan for index in indexes), plan)
+
+
+@override_settings(JSON_FRAGMENT_CACHE_TIMEOUT=0, RESPONSE_CACHE_TIMEOUT=0)
+class FastListSerializerTests(TestCase):
+    """The fast list serializers render the same JSON as the DRF ones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            username="author",
+            email="author@example.com",
+            password="x",
+            nickname="author",
+        )
+        group = QuizGroup.objects.create(title="group", created_by=user)
+        tags = [Tag.objects.create(name=name) for name in ["b", "c", "a", "d"]]
+        for i in range(4):
+            quiz = Quiz.objects.create(
+                question=f"question {i}",
+                answer={"choices": [i, "あ"]},
+                related_group=group if i % 2 else None,
+                created_by=user,
+            )
+            # Added out of name and primary key order.
+            quiz.tags.add(tags[(i + 1) % 4])
+            quiz.tags.add(tags[i % 4])
+            quiz.tags.add(tags[(i + 3) % 4])
+
+    def test_same_json(self):
+        client = APIClient()
+        for path in [
+            "/quiz-api/tag/",
+            "/quiz-api/quizgroup/",
+            "/quiz-api/quiz/",
+            "/quiz-api/quiz/?fields=id,tags",
+        ]:
+            with self.subTest(path):
+                with override_settings(FAST_LIST_SERIALIZATION=False):
+                    expected = client.get(path)
+                with override_settings(FAST_LIST_SERIALIZATION=True):
+                    response = client.get(path)
+                self.assertEqual(expected.status_code, 200)
+                self.assertEqual(response.content, expected.content)
+
+    def test_tags_ordered_by_name(self):
+        client = APIClient()
+        for fast in (False, True):
+            with self.subTest(fast=fast):
+                with override_settings(FAST_LIST_SERIALIZATION=fast):
+                    quizzes = client.get("/quiz-api/quiz/").json()
+                for quiz in quizzes:
+                    self.assertEqual(quiz["tags"], sorted(quiz["tags"]))
+
+
+class SoftDeleteTests(TestCase):
+    """Soft-deleted quiz groups and users release their unique fields."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(
+            username="author", email="author@example.com", password="x", nickname="a"
+        )
+        self.other = User.objects.create_user(
+            username="other", email="other@example.com", password="x", nickname="o"
+        )
+        self.group = QuizGroup.objects.create(title="title", created_by=self.author)
+        self.client = APIClient()
+
+    def create_group(self, user, title):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            "/quiz-api/quizgroup/create/", {"title": title}, format="json"
+        )
+
+    def test_title_taken(self):
+        response = self.create_group(self.other, "title")
+        self.assertEqual(response.status_code, 400)
+
+    def test_title_released_by_group_delete(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.delete(f"/quiz-api/quizgroup/{self.group.pk}/delete/")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.create_group(self.other, "title")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(QuizGroup.objects.filter(pk=self.group.pk).exists())
+
+    def test_title_released_by_user_delete(self):
+        self.author.soft_delete()
+
+        response = self.create_group(self.other, "title")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            QuizGroup.all_objects.get(pk=self.group.pk).title,
+            f"deleted-{self.group.pk.hex}",
+        )
+
+
+class PurgeDeletedTests(TestCase):
+    """purge_deleted removes soft-deleted rows in bounded batches."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(
+            username="author", email="author@example.com", password="x", nickname="a"
+        )
+        self.deleted_user = User.objects.create_user(
+            username="gone", email="gone@example.com", password="x", nickname="g"
+        )
+        self.group = QuizGroup.objects.create(title="kept", created_by=self.author)
+        self.deleted_group = QuizGroup.objects.create(
+            title="deleted", created_by=self.author
+        )
+        self.kept = [
+            Quiz.objects.create(
+                question=f"kept {i}",
+                answer=["a"],
+                related_group=self.group,
+                created_by=self.author,
+            )
+            for i in range(3)
+        ]
+        self.orphans = [
+            Quiz.objects.create(
+                question=f"orphan {i}",
+                answer=["a"],
+                related_group=self.deleted_group,
+                created_by=self.author,
+            )
+            for i in range(3)
+        ]
+        self.deleted = [
+            Quiz.objects.create(
+                question=f"deleted {i}", answer=["a"], created_by=self.deleted_user
+            )
+            for i in range(5)
+        ]
+        for quiz in self.deleted[:2]:
+            quiz.soft_delete()
+        self.deleted_group.soft_delete()
+        # Soft-deletes the other three quizzes with the user.
+        self.deleted_user.soft_delete()
+
+    def test_purge_in_batches(self):
+        out = StringIO()
+        call_command("purge_deleted", batch_size=2, stdout=out)
+
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            [
+                "deleted quizzes: 2/5",
+                "deleted quizzes: 4/5",
+                "deleted quizzes: 5/5",
+                "quizzes detached from deleted groups: 2/3",
+                "quizzes detached from deleted groups: 3/3",
+                "deleted quiz groups: 1/1",
+                "deleted users: 1/1",
+            ],
+        )
+        self.assertFalse(Quiz.all_objects.filter(deleted_at__isnull=False).exists())
+        self.assertFalse(QuizGroup.all_objects.filter(pk=self.deleted_group.pk))
+        self.assertFalse(
+            get_user_model()._base_manager.filter(pk=self.deleted_user.pk).exists()
+        )
+        # Live rows are kept; the quizzes of the deleted group lose it.
+        self.assertEqual(
+            set(Quiz.objects.filter(related_group=self.group)), set(self.kept)
+        )
+        for quiz in self.orphans:
+            quiz.refresh_from_db()
+            self.assertIsNone(quiz.related_group_id)
+
+    def test_nothing_to_purge(self):
+        call_command("purge_deleted", stdout=StringIO())
+        out = StringIO()
+        call_command("purge_deleted", stdout=out)
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            [
+                "deleted quizzes: none",
+                "quizzes detached from deleted groups: none",
+                "deleted quiz groups: none",
+                "deleted users: none",
+            ],
+        )
+
+
+@override_settings(SYNC_TOMBSTONE_RETENTION=30)
+class CompactTombstonesTests(TestCase):
+    """Tombstones past the retention are compacted; older clients resync."""
+
+    def setUp(self):
+        now = timezone.now()
+        for days in [40, 35, 31, 29, 1]:
+            tombstone = Tombstone.objects.create(model_name="quiz", object_id=uuid4())
+            # deleted_at is set on creation only.
+            Tombstone.objects.filter(pk=tombstone.pk).update(
+                deleted_at=now - timedelta(days=days)
+            )
+
+    def test_compact_in_batches(self):
+        out = StringIO()
+        call_command("compact_tombstones", batch_size=2, stdout=out)
+
+        self.assertTrue(out.getvalue().rstrip().endswith(": 3"), out.getvalue())
+        self.assertEqual(Tombstone.objects.count(), 2)
+        horizon = timezone.now() - timedelta(days=30)
+        self.assertFalse(Tombstone.objects.filter(deleted_at__lt=horizon).exists())
+
+    def test_resync_past_retention(self):
+        client = APIClient()
+        for days, resync in [(31, True), (29, False)]:
+            with self.subTest(days=days):
+                since = encode_watermark(timezone.now() - timedelta(days=days))
+                response = client.get("/quiz-api/sync/", {"since": since})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["resync"], resync)
+                # A resync replaces the client's data: no deletions to apply.
+                self.assertEqual(
+                    len(response.json()["deleted"]["quizzes"]), 0 if resync else 1
+                )
+
+
+class ModerationQueueTests(TestCase):
+    """Reviewers lease disjoint batches of the queue, oldest first."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.author, self.alice, self.bob = [
+            User.objects.create_user(
+                username=name,
+                email=f"{name}@example.com",
+                password="x",
+                nickname=name,
+            )
+            for name in ["author", "alice", "bob"]
+        ]
+        now = timezone.now()
+        self.queue = []
+        for i in range(5):
+            quiz = Quiz.objects.create(
+                question=f"question {i}", answer=["a"], created_by=self.author
+            )
+            Quiz.objects.filter(pk=quiz.pk).update(
+                created_at=now - timedelta(minutes=10 - i)
+            )
+            self.queue.append(quiz)
+        Quiz.objects.create(
+            question="checked", answer=["a"], is_checked=True, created_by=self.author
+        )
+        Quiz.objects.create(
+            question="deleted", answer=["a"], created_by=self.author
+        ).soft_delete()
+
+    def test_claims_are_disjoint(self):
+        self.assertEqual(claim_quizzes(self.alice, 3), self.queue[:3])
+        self.assertEqual(claim_quizzes(self.bob, 3), self.queue[3:])
+        # Claiming again renews the quizzes already held.
+        self.assertEqual(claim_quizzes(self.alice, 3), self.queue[:3])
+
+    def test_expired_lease(self):
+        claim_quizzes(self.alice, 2)
+        Quiz.objects.filter(claimed_by=self.alice).update(
+            claimed_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(claim_quizzes(self.bob, 2), self.queue[:2])
+
+    def test_review_held_quizzes_only(self):
+        claim_quizzes(self.alice, 2)
+        claim_quizzes(self.bob, 2)
+        approve = [self.queue[0].pk, self.queue[2].pk]
+        reject = [self.queue[1].pk]
+
+        self.assertEqual(review_quizzes(self.alice, approve, reject), (1, 1))
+        self.assertTrue(Quiz.objects.get(pk=self.queue[0].pk).is_checked)
+        self.assertFalse(Quiz.objects.filter(pk=self.queue[1].pk).exists())
+        # Held by bob: left alone.
+        self.assertFalse(Quiz.objects.get(pk=self.queue[2].pk).is_checked)
@@ -5,15 +5,19 @@ from .views import (
     QuizGroupDetailAPIView,
     QuizListAPIView,
     QuizDetailAPIView,
+    QuizBatchAPIView,
+    RelatedQuizListAPIView,
+    SyncAPIView,
     QuizGroupCreateAPIView,
     QuizGroupUpdateAPIView,
     QuizGroupDeleteAPIView,
     QuizCreateAPIView,
     QuizUpdateAPIView,
     QuizDeleteAPIView,
+    ModerationClaimAPIView,
+    ModerationReviewAPIView,
 )
 
-
 urlpatterns = [
     # Any user can access.
     path(route="tag/", view=TagListAPIView.as_view()),
@@ -21,6 +25,9 @@ urlpatterns = [
     path(route="quizgroup/<uuid:pk>/", view=QuizGroupDetailAPIView.as_view()),
     path(route="quiz/", view=QuizListAPIView.as_view()),
     path(route="quiz/<uuid:pk>/", view=QuizDetailAPIView.as_view()),
+    path(route="quiz/batch/", view=QuizBatchAPIView.as_view()),
+    path(route="quiz/<uuid:pk>/related/", view=RelatedQuizListAPIView.as_view()),
+    path(route="sync/", view=SyncAPIView.as_view()),
     # Authenticated users only can access.
     path(route="quizgroup/create/", view=QuizGroupCreateAPIView.as_view()),
     path(route="quizgroup/<uuid:pk>/update/", view=QuizGroupUpdateAPIView.as_view()),
@@ -28,4 +35,7 @@ urlpatterns = [
     path(route="quiz/create/", view=QuizCreateAPIView.as_view()),
     path(route="quiz/<uuid:pk>/update/", view=QuizUpdateAPIView.as_view()),
     path(route="quiz/<uuid:pk>/delete/", view=QuizDeleteAPIView.as_view()),
+    # Staff users only can access.
+    path(route="moderation/claim/", view=ModerationClaimAPIView.as_view()),
+    path(route="moderation/review/", view=ModerationReviewAPIView.as_view()),
 ]
@@ -1,8 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework import generics, status
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.generics import get_object_or_404
-from .models import Tag, QuizGroup, Quiz
+from rest_framework.utils.urls import replace_query_param
+from quizquartz.metrics import registry
+from .duplicates import find_similar_quizzes, get_buckets, get_shingles, save_buckets
+from .fast_serializers import (
+    FastTagSerializer,
+    FastQuizGroupSerializer,
+    FastQuizSerializer,
+)
+from .filters import QuizFilterBackend
+from .fragments import get_cached_fragments
+from .hits import hit_counter
+from .response_cache import (
+    build_cached_response,
+    make_cache_entry,
+    get_response_cache_version,
+    make_object_cache_key,
+    make_response_cache_key,
+)
+from .sync import decode_watermark, encode_watermark
+from .moderation import claim_quizzes, review_quizzes
+from .models import Tag, QuizGroup, Quiz, QuizRecommendation, Tombstone
 from .serializers import (
     TagSerializer,
     QuizGroupSerializer,
@@ -11,50 +38,460 @@ from .serializers import (
     QuizSerializer,
     QuizCreateSerializer,
     QuizUpdateSerializer,
+    QuizClaimSerializer,
+    QuizReviewSerializer,
 )
+from datetime import timedelta
+from uuid import UUID
+import math
 import re
 
 
-class TagListAPIView(generics.ListAPIView):
+def refresh_group_summaries(*quiz_groups):
+    """Refresh the summary fields of the given quiz groups, skipping None."""
+    refreshed = set()
+    for quiz_group in quiz_groups:
+        if quiz_group is None or quiz_group.pk in refreshed:
+            continue
+        quiz_group.refresh_summary()
+        refreshed.add(quiz_group.pk)
+
+
+def check_duplicate_question(question, exclude_pk=None):
+    """Return the question's LSH buckets and the IDs of its near-duplicates.
+
+    Returns (None, []) when QUIZ_DUPLICATE_CHECK is "off".
+    """
+    if settings.QUIZ_DUPLICATE_CHECK == "off":
+        return None, []
+    shingles = get_shingles(question)
+    buckets = get_buckets(shingles)
+    return buckets, find_similar_quizzes(shingles, buckets, exclude_pk=exclude_pk)
+
+
+def duplicate_response(duplicates):
+    return Response(
+        data={
+            "error": "似た問題が既に存在します。",
+            "duplicates": [str(pk) for pk in duplicates],
+        },
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+class SparseFieldsetQuerysetMixin:
+    """Narrow the queryset to the fields selected by ?fields= / ?omit=."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return self.get_serializer_class().optimize_queryset(
+            queryset, self.request.query_params
+        )
+
+
+class ResponseCacheMixin:
+    """Cache successful JSON GET responses along with their compressed bodies.
+
+    Controlled by the ``RESPONSE_CACHE_TIMEOUT`` setting; 0 disables it. Any
+    change to the data shown by the quiz API invalidates every entry (see
+    ``quizzes.signals``). Compression happens once per cache fill and the
+    CompressionMiddleware serves the stored variants on each hit. Views with
+    ``count_hits`` also count their successful GETs per path, which rank the
+    responses warmed by the warm_cache command.
+    """
+
+    count_hits = False
+
+    def get(self, request, *args, **kwargs):
+        response = self.get_cached_response(request, *args, **kwargs)
+        if self.count_hits and response.status_code == status.HTTP_200_OK:
+            hit_counter.add(request.path)
+        return response
+
+    def get_cached_response(self, request, *args, **kwargs):
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+        if not timeout or request.accepted_renderer.format != "json":
+            return super().get(request, *args, **kwargs)
+
+        key = make_response_cache_key(request)
+        entry = cache.get(key)
+        registry.record_cache("response", hits=entry is not None, misses=entry is None)
+        if entry is not None:
+            return build_cached_response(entry)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            # Render now instead of in finalize_response so the body can be cached.
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            entry = make_cache_entry(response)
+            cache.set(key, entry, timeout)
+            response.precompressed = entry["precompressed"]
+
+        return response
+
+
+class FastListMixin:
+    """Serialize unpaginated lists with ``fast_serializer_class`` when enabled.
+
+    Controlled by the ``FAST_LIST_SERIALIZATION`` setting.
+    """
+
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZATION or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.serialize_list(queryset))
+
+    def serialize_list(self, queryset):
+        if settings.FAST_LIST_SERIALIZATION:
+            serializer = self.fast_serializer_class(
+                queryset, context=self.get_serializer_context()
+            )
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+        return serializer.data
+
+
+class FragmentCacheListMixin(FastListMixin):
+    """Splice cached per-object JSON fragments into unpaginated list responses.
+
+    Controlled by the ``JSON_FRAGMENT_CACHE_TIMEOUT`` setting; 0 disables it.
+    A fragment is reused while the ``fragment_version_fields`` are unchanged.
+    """
+
+    fragment_version_fields = ("updated_at",)
+
+    def list(self, request, *args, **kwargs):
+        timeout = settings.JSON_FRAGMENT_CACHE_TIMEOUT
+        if not timeout or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        field_names = self.get_serializer_class().get_selected_fields(
+            request.query_params
+        )
+        fragments = get_cached_fragments(
+            queryset,
+            field_names,
+            self.serialize_list,
+            timeout,
+            version_fields=self.fragment_version_fields,
+        )
+        if fragments is None:
+            fragments = self.serialize_list(queryset)
+        return Response(fragments)
+
+
+class TagListAPIView(ResponseCacheMixin, FastListMixin, generics.ListAPIView):
     """Tag list view."""
 
     queryset = Tag.objects.filter(is_private=False).order_by("name")
     serializer_class = TagSerializer
+    fast_serializer_class = FastTagSerializer
 
 
-class QuizGroupListAPIView(generics.ListAPIView):
+class QuizGroupListAPIView(
+    ResponseCacheMixin,
+    FragmentCacheListMixin,
+    SparseFieldsetQuerysetMixin,
+    generics.ListAPIView,
+):
     """Quiz group list view."""
 
-    queryset = QuizGroup.objects.all().order_by("-created_at")
+    queryset = QuizGroup.objects.order_by("-created_at")
     serializer_class = QuizGroupSerializer
+    fast_serializer_class = FastQuizGroupSerializer
+    # The author's nickname is embedded, and users have no updated_at.
+    fragment_version_fields = ("updated_at", "created_by__nickname")
 
 
-class QuizGroupDetailAPIView(generics.RetrieveAPIView):
-    """Quiz group detail view."""
+class QuizGroupDetailAPIView(
+    ResponseCacheMixin, SparseFieldsetQuerysetMixin, generics.RetrieveAPIView
+):
+    """Quiz group detail view.
+
+    With ``?include=quizzes`` the group's quizzes are embedded, newest first,
+    one page of ``GROUP_QUIZZES_PAGE_SIZE`` at a time (``?quizzes_page=``).
+    Group, quizzes and tags take three queries whatever the page size.
+    """
 
     queryset = QuizGroup.objects.all()
     serializer_class = QuizGroupSerializer
+    count_hits = True
+
+    def includes_quizzes(self):
+        include = self.request.query_params.get("include", "")
+        return "quizzes" in include.split(",")
+
+    def get_quizzes_page(self):
+        try:
+            page = int(self.request.query_params.get("quizzes_page", 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            raise ParseError(detail={"error": "無効なページ番号です。"})
+        return page
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.includes_quizzes():
+            return queryset
+
+        # The quiz count is read from the group even when ?fields= omits it.
+        columns, _ = queryset.query.deferred_loading
+        queryset = queryset.only(*columns, "quiz_count")
+
+        page_size = settings.GROUP_QUIZZES_PAGE_SIZE
+        start = (self.get_quizzes_page() - 1) * page_size
+        quizzes = QuizSerializer.optimize_queryset(
+            Quiz.objects.order_by("-created_at", "pk"), {}
+        )
+        return queryset.prefetch_related(
+            Prefetch(
+                "quizzes",
+                queryset=quizzes[start : start + page_size],
+                to_attr="included_quizzes",
+            )
+        )
 
-
-class QuizListAPIView(generics.ListAPIView):
+    def retrieve(self, request, *args, **kwargs):
+        if not self.includes_quizzes():
+            return super().retrieve(request, *args, **kwargs)
+
+        quiz_group = self.get_object()
+        data = self.get_serializer(quiz_group).data
+        page = self.get_quizzes_page()
+        url = request.build_absolute_uri()
+        last_page = math.ceil(quiz_group.quiz_count / settings.GROUP_QUIZZES_PAGE_SIZE)
+        data["quizzes"] = {
+            "count": quiz_group.quiz_count,
+            "next": (
+                replace_query_param(url, "quizzes_page", page + 1)
+                if page < last_page
+                else None
+            ),
+            "previous": (
+                replace_query_param(url, "quizzes_page", page - 1) if page > 1 else None
+            ),
+            "results": QuizSerializer(quiz_group.included_quizzes, many=True).data,
+        }
+        return Response(data)
+
+
+class QuizListAPIView(
+    ResponseCacheMixin,
+    FragmentCacheListMixin,
+    SparseFieldsetQuerysetMixin,
+    generics.ListAPIView,
+):
     """Quiz list view."""
 
     queryset = Quiz.objects.all().order_by("-created_at")
     serializer_class = QuizSerializer
+    fast_serializer_class = FastQuizSerializer
+    filter_backends = [QuizFilterBackend]
+    # The group title and the author's nickname are embedded, so they key the
+    # fragment themselves: the group's updated_at changes with every write to
+    # any of its quizzes. Deleting a group leaves its quizzes untouched until
+    # they are detached.
+    fragment_version_fields = (
+        "updated_at",
+        "related_group__title",
+        "related_group__deleted_at",
+        "created_by__nickname",
+    )
+
+
+class QuizDetailAPIView(
+    ResponseCacheMixin, SparseFieldsetQuerysetMixin, generics.RetrieveAPIView
+):
+    """Quiz detail view."""
+
+    queryset = Quiz.objects.all()
+    serializer_class = QuizSerializer
+    count_hits = True
 
 
-class QuizDetailAPIView(generics.RetrieveAPIView):
-    """Quiz detail view."""
+class RelatedQuizListAPIView(
+    ResponseCacheMixin, SparseFieldsetQuerysetMixin, generics.ListAPIView
+):
+    """Related quiz list view.
+
+    Serves the recommendations precomputed by the build_recommendations
+    command, best first, with a primary key lookup instead of scoring joins.
+    Quizzes created since the last build have none yet.
+    """
+
+    queryset = Quiz.objects.all()
+    serializer_class = QuizSerializer
+
+    def list(self, request, pk, *args, **kwargs):
+        quiz = get_object_or_404(
+            Quiz.objects.select_related("recommendation").only(
+                "pk", "recommendation__related_ids"
+            ),
+            pk=pk,
+        )
+        try:
+            related_ids = quiz.recommendation.related_ids
+        except QuizRecommendation.DoesNotExist:
+            related_ids = []
+
+        position = {UUID(related_id): i for i, related_id in enumerate(related_ids)}
+        quizzes = sorted(
+            self.get_queryset().filter(pk__in=position),
+            key=lambda related: position[related.pk],
+        )
+        return Response(self.get_serializer(quizzes, many=True).data)
+
+
+class QuizBatchAPIView(SparseFieldsetQuerysetMixin, generics.GenericAPIView):
+    """Quiz batch lookup view.
+
+    ``?ids=a,b,c`` returns up to ``QUIZ_BATCH_MAX_IDS`` quizzes in request
+    order, with ``null`` in place of (and ``not_found`` listing) the IDs with
+    no quiz. Each serialized quiz is cached for ``QUIZ_BATCH_CACHE_TIMEOUT``
+    seconds, and the misses are read with a single ``id__in`` query.
+    """
 
     queryset = Quiz.objects.all()
     serializer_class = QuizSerializer
 
+    def get_ids(self):
+        ids = self.request.query_params.get("ids", "")
+        try:
+            ids = [UUID(value) for value in ids.split(",") if value]
+        except ValueError:
+            raise ParseError(detail={"error": "無効なIDが含まれています。"})
+        if not ids:
+            raise ParseError(detail={"error": "IDを指定してください。"})
+        if len(ids) > settings.QUIZ_BATCH_MAX_IDS:
+            raise ParseError(
+                detail={
+                    "error": f"IDは{settings.QUIZ_BATCH_MAX_IDS}個まで指定できます。"
+                }
+            )
+        return ids
+
+    def get(self, request, *args, **kwargs):
+        ids = self.get_ids()
+        field_names = self.get_serializer_class().get_selected_fields(
+            request.query_params
+        )
+        timeout = settings.QUIZ_BATCH_CACHE_TIMEOUT
+        version = get_response_cache_version() if timeout else None
+        keys = {pk: make_object_cache_key(Quiz, pk, field_names, version) for pk in ids}
+        cached = cache.get_many(keys.values()) if timeout else {}
+        found = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+        missing = [pk for pk in keys if pk not in found]
+        if timeout:
+            registry.record_cache("object", hits=len(found), misses=len(missing))
+        if missing:
+            quizzes = list(self.get_queryset().filter(pk__in=missing))
+            # Matched by position, as "id" need not be a selected field.
+            items = self.get_serializer(quizzes, many=True).data
+            fetched = {quiz.pk: item for quiz, item in zip(quizzes, items)}
+            if timeout and fetched:
+                cache.set_many(
+                    {keys[pk]: item for pk, item in fetched.items()}, timeout
+                )
+            found.update(fetched)
+
+        return Response(
+            {
+                "results": [found.get(pk) for pk in ids],
+                "not_found": [str(pk) for pk in keys if pk not in found],
+            }
+        )
+
+
+class SyncAPIView(APIView):
+    """Delta sync view.
+
+    Returns the tags, quiz groups and quizzes changed after the ``since``
+    watermark, the IDs deleted since then and a new watermark for the next
+    call. Without ``since`` everything is returned. So is it when ``since`` is
+    older than the tombstones kept (``SYNC_TOMBSTONE_RETENTION``), with
+    ``resync`` set to tell the client to replace its data instead of merging.
+    """
+
+    def get(self, request, *args, **kwargs):
+        now = timezone.now()
+        since = request.query_params.get("since")
+        since = decode_watermark(since) if since else None
+        resync = since is not None and since < now - timedelta(
+            days=settings.SYNC_TOMBSTONE_RETENTION
+        )
+        if resync:
+            since = None
+        # Stop short of "now" so rows saved by still-open transactions are
+        # picked up by the next call instead of being skipped.
+        watermark = now - timedelta(seconds=settings.SYNC_WATERMARK_LAG)
+
+        changed = {"updated_at__lte": watermark}
+        deleted = {"deleted_at__lte": watermark}
+        if since is not None:
+            changed["updated_at__gt"] = since
+            deleted["deleted_at__gt"] = since
+
+        tags = Tag.objects.filter(**changed).order_by("updated_at")
+        quiz_groups = QuizGroupSerializer.optimize_queryset(
+            QuizGroup.objects.filter(**changed).order_by("updated_at"), {}
+        )
+        quizzes = QuizSerializer.optimize_queryset(
+            Quiz.objects.filter(**changed).order_by("updated_at"), {}
+        )
+
+        tombstones = {"tag": [], "quizgroup": [], "quiz": []}
+        if since is not None:
+            for model_name, object_id in Tombstone.objects.filter(
+                **deleted
+            ).values_list("model_name", "object_id"):
+                tombstones[model_name].append(str(object_id))
+            # Soft-deleted rows not purged yet have no tombstone of their own.
+            for model in (QuizGroup, Quiz):
+                tombstones[model._meta.model_name].extend(
+                    str(pk)
+                    for pk in model.all_objects.filter(**deleted).values_list(
+                        "pk", flat=True
+                    )
+                )
+            # Tags turned private disappear from the client like deleted ones.
+            tombstones["tag"].extend(
+                str(pk)
+                for pk in tags.filter(is_private=True).values_list("pk", flat=True)
+            )
+
+        return Response(
+            data={
+                "watermark": encode_watermark(watermark),
+                "resync": resync,
+                "tags": TagSerializer(tags.filter(is_private=False), many=True).data,
+                "quiz_groups": QuizGroupSerializer(quiz_groups, many=True).data,
+                "quizzes": QuizSerializer(quizzes, many=True).data,
+                "deleted": {
+                    "tags": tombstones["tag"],
+                    "quiz_groups": tombstones["quizgroup"],
+                    "quizzes": tombstones["quiz"],
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 class QuizGroupCreateAPIView(generics.CreateAPIView):
     """Quiz group create view."""
 
     serializer_class = QuizGroupCreateSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -78,6 +515,7 @@ class QuizGroupUpdateAPIView(generics.UpdateAPIView):
     queryset = QuizGroup.objects.all()
     serializer_class = QuizGroupUpdateSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def put(self, request, pk, *args, **kwargs):
         quiz_group = get_object_or_404(queryset=QuizGroup, pk=pk)
@@ -108,6 +546,7 @@ class QuizGroupDeleteAPIView(generics.DestroyAPIView):
 
     queryset = QuizGroup.objects.all()
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def delete(self, request, pk, *args, **kwargs):
         quiz_group = get_object_or_404(queryset=QuizGroup, pk=pk)
@@ -118,7 +557,7 @@ class QuizGroupDeleteAPIView(generics.DestroyAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        quiz_group.delete()
+        quiz_group.soft_delete()
         return Response(
             data={"message": "クイズグループの削除に成功しました。"},
             status=status.HTTP_200_OK,
@@ -130,6 +569,7 @@ class QuizCreateAPIView(generics.CreateAPIView):
 
     serializer_class = QuizCreateSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def post(self, request, *args, **kwargs):
         tags = request.data.get("tags", [])
@@ -165,14 +605,25 @@ class QuizCreateAPIView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
 
         if serializer.is_valid(raise_exception=True):
-            quiz = serializer.save(created_by=request.user)
-            return Response(
-                data={
-                    "message": "クイズの作成に成功しました。",
-                    "quiz": QuizSerializer(quiz).data,
-                },
-                status=status.HTTP_201_CREATED,
+            buckets, duplicates = check_duplicate_question(
+                serializer.validated_data["question"]
             )
+            if duplicates and settings.QUIZ_DUPLICATE_CHECK == "block":
+                return duplicate_response(duplicates)
+
+            with transaction.atomic():
+                quiz = serializer.save(created_by=request.user)
+                if buckets is not None:
+                    save_buckets(quiz.pk, buckets)
+                refresh_group_summaries(quiz.related_group)
+            data = {
+                "message": "クイズの作成に成功しました。",
+                "quiz": QuizSerializer(quiz).data,
+            }
+            if duplicates:
+                data["warning"] = "似た問題が既に存在します。"
+                data["duplicates"] = [str(pk) for pk in duplicates]
+            return Response(data=data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -183,6 +634,7 @@ class QuizUpdateAPIView(generics.UpdateAPIView):
     queryset = Quiz.objects.all()
     serializer_class = QuizUpdateSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def put(self, request, pk, *args, **kwargs):
         quiz = get_object_or_404(queryset=Quiz, pk=pk)
@@ -224,14 +676,29 @@ class QuizUpdateAPIView(generics.UpdateAPIView):
         serializer = self.get_serializer(quiz, data=request.data, partial=True)
 
         if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            return Response(
-                data={
-                    "message": "クイズの更新に成功しました。",
-                    "quiz": QuizSerializer(quiz).data,
-                },
-                status=status.HTTP_200_OK,
-            )
+            question = serializer.validated_data.get("question")
+            buckets, duplicates = None, []
+            if question is not None and question != quiz.question:
+                buckets, duplicates = check_duplicate_question(
+                    question, exclude_pk=quiz.pk
+                )
+            if duplicates and settings.QUIZ_DUPLICATE_CHECK == "block":
+                return duplicate_response(duplicates)
+
+            previous_group = quiz.related_group
+            with transaction.atomic():
+                serializer.save()
+                if buckets is not None:
+                    save_buckets(quiz.pk, buckets)
+                refresh_group_summaries(previous_group, quiz.related_group)
+            data = {
+                "message": "クイズの更新に成功しました。",
+                "quiz": QuizSerializer(quiz).data,
+            }
+            if duplicates:
+                data["warning"] = "似た問題が既に存在します。"
+                data["duplicates"] = [str(pk) for pk in duplicates]
+            return Response(data=data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -242,6 +709,7 @@ class QuizDeleteAPIView(generics.DestroyAPIView):
     queryset = Quiz.objects.all()
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
 
     def delete(self, request, pk, *args, **kwargs):
         quiz = get_object_or_404(queryset=Quiz, pk=pk)
@@ -252,8 +720,70 @@ class QuizDeleteAPIView(generics.DestroyAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        quiz.delete()
+        with transaction.atomic():
+            quiz.soft_delete()
+            refresh_group_summaries(quiz.related_group)
         return Response(
             data={"message": "クイズの削除に成功しました。"},
             status=status.HTTP_200_OK,
         )
+
+
+class ModerationClaimAPIView(generics.GenericAPIView):
+    """Moderation queue claim view.
+
+    Leases the oldest unchecked quizzes nobody else holds to the reviewer
+    (``count``, at most ``MODERATION_BATCH_SIZE``) and returns them.
+    """
+
+    serializer_class = QuizClaimSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+
+        if serializer.is_valid(raise_exception=True):
+            count = serializer.validated_data.get(
+                "count", settings.MODERATION_BATCH_SIZE
+            )
+            quizzes = claim_quizzes(request.user, count)
+            return Response(
+                data={
+                    "claimed_until": quizzes[0].claimed_until if quizzes else None,
+                    "quizzes": QuizSerializer(quizzes, many=True).data,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ModerationReviewAPIView(generics.GenericAPIView):
+    """Moderation queue review view.
+
+    Approves (``approve``) or rejects (``reject``) quizzes the reviewer holds.
+    Quizzes whose lease expired or was taken over are not counted.
+    """
+
+    serializer_class = QuizReviewSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+
+        if serializer.is_valid(raise_exception=True):
+            approved, rejected = review_quizzes(
+                request.user,
+                approve=serializer.validated_data.get("approve", []),
+                reject=serializer.validated_data.get("reject", []),
+            )
+            return Response(
+                data={
+                    "message": "クイズの審査に成功しました。",
+                    "approved": approved,
+                    "rejected": rejected,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
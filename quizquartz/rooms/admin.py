@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import Room, LeaderboardScore
+
+
+@admin.register(Room)
+class RoomAdmin(admin.ModelAdmin):
+    list_display = ("code", "host", "round_count", "created_at", "closed_at")
+    list_select_related = ("host",)
+    search_fields = ("code",)
+    autocomplete_fields = ("host",)
+    readonly_fields = ("id", "code", "created_at")
+    ordering = ("-created_at",)
+
+
+@admin.register(LeaderboardScore)
+class LeaderboardScoreAdmin(admin.ModelAdmin):
+    list_display = ("board", "user", "score", "updated_at")
+    list_select_related = ("user",)
+    search_fields = ("board",)
+    autocomplete_fields = ("user",)
+    ordering = ("board", "-score")
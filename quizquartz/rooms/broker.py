@@ -0,0 +1,87 @@
+"""Pub/sub between the WebSocket connections of the rooms.
+
+Messages are encoded JSON strings, published once to a channel and handed to
+every callback subscribed to it. Callbacks are plain functions that must not
+block: they only queue the message for their connections. The broker is
+chosen by ``ROOM_BROKER_URL``:
+
+    memory://               connections of one process (the default)
+    redis://host:6379/0     connections of every process (needs redis)
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+from urllib.parse import urlparse
+import asyncio
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional.
+    aioredis = None
+
+
+class InProcessBroker:
+    """Broker delivering messages to the subscribers of the same process."""
+
+    def __init__(self):
+        self.callbacks = defaultdict(set)
+
+    async def subscribe(self, channel, callback):
+        self.callbacks[channel].add(callback)
+
+    async def unsubscribe(self, channel, callback):
+        callbacks = self.callbacks.get(channel)
+        if callbacks is not None:
+            callbacks.discard(callback)
+            if not callbacks:
+                del self.callbacks[channel]
+
+    async def publish(self, channel, message):
+        for callback in list(self.callbacks.get(channel, ())):
+            callback(message)
+
+
+class RedisBroker(InProcessBroker):
+    """Broker relaying messages through Redis pub/sub.
+
+    Each process holds one Redis subscription per channel with local
+    subscribers and dispatches what it receives to them.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        self.client = aioredis.Redis.from_url(url)
+        self.pubsub = self.client.pubsub()
+        self.listener = None
+
+    async def subscribe(self, channel, callback):
+        if channel not in self.callbacks:
+            await self.pubsub.subscribe(channel)
+        await super().subscribe(channel, callback)
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.create_task(self.listen())
+
+    async def unsubscribe(self, channel, callback):
+        await super().unsubscribe(channel, callback)
+        if channel not in self.callbacks:
+            await self.pubsub.unsubscribe(channel)
+
+    async def publish(self, channel, message):
+        await self.client.publish(channel, message)
+
+    async def listen(self):
+        async for item in self.pubsub.listen():
+            if item["type"] != "message":
+                continue
+            channel = item["channel"].decode()
+            await super().publish(channel, item["data"].decode())
+
+
+@lru_cache(maxsize=None)
+def get_room_broker(url):
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return InProcessBroker()
+    if parsed.scheme in ("redis", "rediss", "unix") and aioredis is not None:
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported ROOM_BROKER_URL: {url}")
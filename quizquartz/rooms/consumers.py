@@ -0,0 +1,432 @@
+"""WebSocket endpoint of the rooms, served beside Django by the ASGI app.
+
+Clients connect to ``ws/rooms/<code>/?token=<auth token>``. The room's host
+sends::
+
+    {"type": "start_round", "quiz": "<quiz id>"}
+    {"type": "end_round"}
+    {"type": "close"}
+
+and participants send::
+
+    {"type": "answer", "round": <number>, "answer": <answer>}
+
+Everyone in the room receives "round" (the quiz without its answer),
+"round_result" and "closed" messages; the host also receives "progress"
+updates with the number of answers. A round is run by the process of the
+host's connection: answers reach it through the broker, are kept in memory
+and saved with one bulk insert when the round ends, along with the points
+of the correct answers (see ``rooms.leaderboards``).
+
+Each connection sends from a bounded queue (``ROOM_SEND_QUEUE_SIZE``) in its
+own task, so a broadcast never waits for a client. A client too slow to keep
+its queue from filling up is disconnected (code 4008) instead of holding
+messages for the whole room.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.authtoken.models import Token
+from quizzes.models import Quiz
+from .broker import get_room_broker
+from .leaderboards import GLOBAL_BOARD, add_points, get_group_board
+from .models import Room, RoomAnswer
+from urllib.parse import parse_qs
+from uuid import UUID
+import asyncio
+import functools
+import json
+import re
+
+CLOSE_UNAUTHORIZED = 4001
+CLOSE_NOT_FOUND = 4004
+CLOSE_TOO_SLOW = 4008
+
+ROOM_PATH = re.compile(r"^/ws/rooms/(?P<code>[A-Z0-9]+)/$")
+
+
+def encode(message):
+    return json.dumps(message, ensure_ascii=False, cls=DjangoJSONEncoder)
+
+
+CLOSED = encode({"type": "closed"})
+
+
+def error(message):
+    return encode({"type": "error", "error": message})
+
+
+def is_correct_answer(correct, answer):
+    """Return True if the answer is the quiz's answer or one of its answers."""
+    if isinstance(correct, list):
+        return answer in correct
+    return answer == correct
+
+
+def database_sync_to_async(func):
+    """Like sync_to_async, for functions using the database.
+
+    A socket may stay open for hours, outside Django's request cycle, which
+    closes unusable and expired connections before and after each request:
+    do the same before and after each call (as channels.db does).
+    """
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call)
+
+
+@database_sync_to_async
+def authenticate(key):
+    token = Token.objects.select_related("user").filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+@database_sync_to_async
+def get_open_room(code):
+    return Room.objects.filter(code=code, closed_at__isnull=True).first()
+
+
+@database_sync_to_async
+def get_quiz(pk):
+    return (
+        Quiz.objects.only("pk", "question", "answer", "related_group")
+        .filter(pk=pk)
+        .first()
+    )
+
+
+@database_sync_to_async
+def save_round(room, quiz, number, answers):
+    boards = [GLOBAL_BOARD]
+    if quiz.related_group_id is not None:
+        boards.append(get_group_board(quiz.related_group_id))
+
+    with transaction.atomic():
+        RoomAnswer.objects.bulk_create(answers, ignore_conflicts=True)
+        Room.objects.filter(pk=room.pk).update(round_count=number)
+        add_points(boards, [answer.user_id for answer in answers if answer.is_correct])
+
+
+@database_sync_to_async
+def close_room(room):
+    Room.objects.filter(pk=room.pk).update(closed_at=timezone.now())
+
+
+class Connection:
+    """A WebSocket client, sent to from a bounded queue by a task of its own."""
+
+    def __init__(self, send, user):
+        self.send = send
+        self.user = user
+        self.queue = asyncio.Queue(maxsize=settings.ROOM_SEND_QUEUE_SIZE)
+        # The task serving the connection, cancelled if the client is dropped.
+        self.task = asyncio.current_task()
+        self.dropped = False
+
+    def push(self, message):
+        """Queue a message without waiting; None closes the connection."""
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped = True
+            self.task.cancel()
+
+    async def sender(self):
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                await self.send({"type": "websocket.close", "code": 1000})
+                return
+            await self.send({"type": "websocket.send", "text": message})
+
+
+class LocalRoom:
+    """The connections of this process to a room, fed from the room's channel."""
+
+    def __init__(self, code):
+        self.channel = f"room:{code}"
+        self.connections = set()
+
+    def deliver(self, message):
+        for connection in self.connections:
+            connection.push(message)
+            if message == CLOSED:
+                connection.push(None)
+
+
+local_rooms = {}
+
+
+async def join_room(code, connection):
+    local_room = local_rooms.get(code)
+    if local_room is None:
+        local_room = local_rooms[code] = LocalRoom(code)
+        await get_room_broker(settings.ROOM_BROKER_URL).subscribe(
+            local_room.channel, local_room.deliver
+        )
+    local_room.connections.add(connection)
+
+
+async def leave_room(code, connection):
+    local_room = local_rooms[code]
+    local_room.connections.discard(connection)
+    if not local_room.connections:
+        del local_rooms[code]
+        await get_room_broker(settings.ROOM_BROKER_URL).unsubscribe(
+            local_room.channel, local_room.deliver
+        )
+
+
+class Round:
+    """A round's quiz and answers, kept in memory until the round ends."""
+
+    def __init__(self, number, quiz):
+        self.number = number
+        self.quiz = quiz
+        self.answers = {}
+
+    def add(self, user_pk, answer, answered_at):
+        # Only the first answer of each participant counts.
+        self.answers.setdefault(user_pk, (answer, answered_at))
+
+
+class Session:
+    """Base class of the handlers of a connection's messages."""
+
+    def __init__(self, room, connection):
+        self.room = room
+        self.connection = connection
+        self.broker = get_room_broker(settings.ROOM_BROKER_URL)
+        self.room_channel = f"room:{room.code}"
+        self.answers_channel = f"room:{room.code}:answers"
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def handle(self, message):
+        """Handle a message; those no session type accepts are rejected."""
+        self.connection.push(error("無効なメッセージです。"))
+
+
+class ParticipantSession(Session):
+    """Handler of a participant's answers."""
+
+    def __init__(self, room, connection):
+        super().__init__(room, connection)
+        self.answered_round = None
+
+    async def handle(self, message):
+        if message.get("type") != "answer":
+            await super().handle(message)
+            return
+        if message.get("round") == self.answered_round:
+            self.connection.push(error("このラウンドには既に回答しています。"))
+            return
+
+        self.answered_round = message.get("round")
+        await self.broker.publish(
+            self.answers_channel,
+            encode(
+                {
+                    "user": self.connection.user.pk,
+                    "round": message.get("round"),
+                    "answer": message.get("answer"),
+                    "answered_at": timezone.now(),
+                }
+            ),
+        )
+
+
+class HostSession(Session):
+    """Handler of the host's commands, running the rounds of the room."""
+
+    def __init__(self, room, connection):
+        super().__init__(room, connection)
+        self.round = None
+        self.progress_handle = None
+
+    async def start(self):
+        await self.broker.subscribe(self.answers_channel, self.receive_answer)
+
+    async def stop(self):
+        await self.broker.unsubscribe(self.answers_channel, self.receive_answer)
+        if self.round is not None:
+            await self.end_round()
+
+    def receive_answer(self, message):
+        data = json.loads(message)
+        if self.round is None or data["round"] != self.round.number:
+            return
+        self.round.add(data["user"], data["answer"], data["answered_at"])
+        # Progress updates are coalesced, one per ROOM_PROGRESS_INTERVAL.
+        if self.progress_handle is None:
+            self.progress_handle = asyncio.get_running_loop().call_later(
+                settings.ROOM_PROGRESS_INTERVAL, self.send_progress
+            )
+
+    def send_progress(self):
+        self.progress_handle = None
+        if self.round is not None:
+            self.connection.push(
+                encode(
+                    {
+                        "type": "progress",
+                        "round": self.round.number,
+                        "answers": len(self.round.answers),
+                    }
+                )
+            )
+
+    async def handle(self, message):
+        kind = message.get("type")
+        if kind == "start_round":
+            await self.start_round(message.get("quiz"))
+        elif kind == "end_round":
+            if self.round is None:
+                self.connection.push(error("進行中のラウンドがありません。"))
+            else:
+                await self.end_round()
+        elif kind == "close":
+            if self.round is not None:
+                await self.end_round()
+            await close_room(self.room)
+            await self.broker.publish(self.room_channel, CLOSED)
+        else:
+            await super().handle(message)
+
+    async def start_round(self, quiz_pk):
+        if self.round is not None:
+            self.connection.push(error("前のラウンドが終了していません。"))
+            return
+        try:
+            quiz = await get_quiz(UUID(str(quiz_pk)))
+        except ValueError:
+            quiz = None
+        if quiz is None:
+            self.connection.push(error("クイズが見つかりません。"))
+            return
+
+        self.round = Round(self.room.round_count + 1, quiz)
+        self.room.round_count = self.round.number
+        await self.broker.publish(
+            self.room_channel,
+            encode(
+                {
+                    "type": "round",
+                    "round": self.round.number,
+                    "quiz": {"id": quiz.pk, "question": quiz.question},
+                }
+            ),
+        )
+
+    async def end_round(self):
+        current, self.round = self.round, None
+        if self.progress_handle is not None:
+            self.progress_handle.cancel()
+            self.progress_handle = None
+
+        answers = [
+            RoomAnswer(
+                room=self.room,
+                round=current.number,
+                quiz=current.quiz,
+                user_id=user_pk,
+                answer=answer,
+                is_correct=is_correct_answer(current.quiz.answer, answer),
+                answered_at=parse_datetime(answered_at),
+            )
+            for user_pk, (answer, answered_at) in current.answers.items()
+        ]
+        await save_round(self.room, current.quiz, current.number, answers)
+        await self.broker.publish(
+            self.room_channel,
+            encode(
+                {
+                    "type": "round_result",
+                    "round": current.number,
+                    "answer": current.quiz.answer,
+                    "answered": len(answers),
+                    "correct": sum(answer.is_correct for answer in answers),
+                }
+            ),
+        )
+
+
+async def serve(session, receive):
+    connection = session.connection
+    sender = asyncio.create_task(connection.sender())
+    await join_room(session.room.code, connection)
+    await session.start()
+    try:
+        while True:
+            event = await receive()
+            if event["type"] == "websocket.disconnect":
+                break
+            try:
+                message = json.loads(event.get("text") or "")
+            except ValueError:
+                message = None
+            if isinstance(message, dict):
+                await session.handle(message)
+            else:
+                connection.push(error("無効なメッセージです。"))
+    except asyncio.CancelledError:
+        if not connection.dropped:
+            raise
+    finally:
+        sender.cancel()
+        await leave_room(session.room.code, connection)
+        await session.stop()
+
+    if connection.dropped:
+        # The client may not be reading at all; give up on a clean close.
+        try:
+            await asyncio.wait_for(
+                connection.send({"type": "websocket.close", "code": CLOSE_TOO_SLOW}),
+                timeout=1,
+            )
+        except (asyncio.TimeoutError, OSError):
+            pass
+
+
+async def websocket_application(scope, receive, send):
+    """ASGI application of the ``websocket`` scopes."""
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode())
+    token = query.get("token", [""])[0]
+    user = await authenticate(token) if token else None
+    if user is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    match = ROOM_PATH.match(scope["path"])
+    room = await get_open_room(match["code"]) if match else None
+    if room is None:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+
+    await send({"type": "websocket.accept"})
+    connection = Connection(send, user)
+    session_class = HostSession if room.host_id == user.pk else ParticipantSession
+    await serve(session_class(room, connection), receive)
@@ -0,0 +1,407 @@
+"""Leaderboards of the points scored in rooms, globally and per quiz group.
+
+A participant scores a point per correct answer, on the "global" board and
+on the board of the quiz's group. ``LeaderboardScore`` is the durable copy,
+updated with the answers of each round. The ranking itself is read from a
+sorted set store chosen by ``LEADERBOARD_STORE_URL``:
+
+    memory://               sorted sets in each process (the default)
+    redis://host:6379/0     Redis sorted sets shared by every process
+
+Either way a board is loaded from the table the first time it is read, so
+the rankings survive restarts. In-process boards are also caught up with the
+rows other processes changed, every ``LEADERBOARD_REFRESH_INTERVAL`` seconds,
+and loaded again when another process removed scores from them.
+Deactivated users are taken off the boards, so that ranks have no gaps.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Leaderboard, LeaderboardScore
+from datetime import timedelta
+from functools import lru_cache
+from urllib.parse import urlparse
+import random
+import threading
+
+try:
+    import redis
+except ImportError:  # redis is optional.
+    redis = None
+
+GLOBAL_BOARD = "global"
+
+
+def get_group_board(group_pk):
+    return f"group:{group_pk}"
+
+
+def get_generation(board):
+    """Return the number of removals from the board so far."""
+    generation = (
+        Leaderboard.objects.filter(board=board)
+        .values_list("generation", flat=True)
+        .first()
+    )
+    return generation or 0
+
+
+class SkipListNode:
+    __slots__ = ("key", "forward", "span")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.forward = [None] * level
+        self.span = [0] * level
+
+
+class SortedSet:
+    """Members ordered by descending score, like a Redis sorted set.
+
+    An indexable skip list: each link stores how many members it skips, so
+    adding, removing and ranking a member and reaching the start of a range
+    are O(log n). Ties are ordered by member.
+    """
+
+    max_level = 32
+    probability = 0.25
+
+    def __init__(self):
+        self.head = SkipListNode(None, self.max_level)
+        self.level = 1
+        self.scores = {}
+
+    def __len__(self):
+        return len(self.scores)
+
+    @classmethod
+    def from_scores(cls, scores):
+        """Build a sorted set from (member, score) pairs in O(n log n).
+
+        The pairs are sorted once and linked in order, instead of searching
+        the skip list for each of them.
+        """
+        sorted_set = cls()
+        last = [sorted_set.head] * cls.max_level
+        last_rank = [0] * cls.max_level
+        items = sorted(scores, key=lambda item: (-item[1], item[0]))
+        for rank, (member, score) in enumerate(items, 1):
+            level = sorted_set.random_level()
+            sorted_set.level = max(sorted_set.level, level)
+            node = SkipListNode((-score, member), level)
+            for i in range(level):
+                last[i].forward[i] = node
+                last[i].span[i] = rank - last_rank[i]
+                last[i] = node
+                last_rank[i] = rank
+            sorted_set.scores[member] = score
+        return sorted_set
+
+    def random_level(self):
+        level = 1
+        while level < self.max_level and random.random() < self.probability:
+            level += 1
+        return level
+
+    def find(self, key):
+        """Return the last node before the key on each level."""
+        update = [self.head] * self.max_level
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+        return update
+
+    def insert(self, key):
+        update = [self.head] * self.max_level
+        rank = [0] * self.max_level
+        node = self.head
+        for i in reversed(range(self.level)):
+            rank[i] = 0 if i == self.level - 1 else rank[i + 1]
+            while node.forward[i] is not None and node.forward[i].key < key:
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self.random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                self.head.span[i] = len(self.scores)
+            self.level = level
+
+        node = SkipListNode(key, level)
+        for i in range(level):
+            node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = node
+            node.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+
+    def remove(self, key):
+        update = self.find(key)
+        node = update[0].forward[0]
+        for i in range(self.level):
+            if update[i].forward[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].forward[i] = node.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+
+    def set(self, member, score):
+        previous = self.scores.get(member)
+        if previous == score:
+            return
+        if previous is not None:
+            self.remove((-previous, member))
+        self.insert((-score, member))
+        self.scores[member] = score
+
+    def increment(self, member, amount):
+        self.set(member, self.scores.get(member, 0) + amount)
+
+    def discard(self, member):
+        score = self.scores.pop(member, None)
+        if score is not None:
+            self.remove((-score, member))
+
+    def rank(self, member):
+        """Return the member's 0-based position, or None."""
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        key = (-score, member)
+        rank = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and node.forward[i].key <= key:
+                rank += node.span[i]
+                node = node.forward[i]
+            if node.key == key:
+                return rank - 1
+        return None
+
+    def range(self, start, stop):
+        """Return the (member, score) pairs at positions start to stop - 1."""
+        traversed = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and traversed + node.span[i] <= start:
+                traversed += node.span[i]
+                node = node.forward[i]
+
+        items = []
+        node = node.forward[0]
+        while node is not None and len(items) < stop - start:
+            score, member = node.key
+            items.append((member, -score))
+            node = node.forward[0]
+        return items
+
+
+class MemoryLeaderboardStore:
+    """Boards held as sorted sets in this process."""
+
+    def __init__(self):
+        self.boards = {}
+        self.generations = {}
+        self.refreshed_at = {}
+        # Guards the sorted sets; loads take the other lock, so that a board
+        # being read from the table does not block the others.
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+
+    def is_fresh(self, board, now):
+        refreshed_at = self.refreshed_at.get(board)
+        interval = timedelta(seconds=settings.LEADERBOARD_REFRESH_INTERVAL)
+        return refreshed_at is not None and now - refreshed_at < interval
+
+    def get_board(self, board):
+        """Return the board's sorted set, loaded or caught up from the table."""
+        if self.is_fresh(board, timezone.now()):
+            return self.boards[board]
+
+        with self.load_lock:
+            now = timezone.now()
+            if self.is_fresh(board, now):
+                return self.boards[board]
+
+            # Read before the rows: a removal committed in between only makes
+            # the next refresh load the board again.
+            generation = get_generation(board)
+            scores = LeaderboardScore.objects.filter(board=board)
+            refreshed_at = self.refreshed_at.get(board)
+            if refreshed_at is None or generation != self.generations[board]:
+                # Rows deleted by other processes (see remove_user) cannot be
+                # caught up with: load the board again.
+                rows = scores.values_list("user_id", "score").iterator(chunk_size=10000)
+                sorted_set = SortedSet.from_scores(
+                    (str(user_pk), score) for user_pk, score in rows
+                )
+                with self.lock:
+                    self.boards[board] = sorted_set
+            else:
+                # Rows are stamped before their transaction commits, so the
+                # previous interval is read again.
+                interval = timedelta(seconds=settings.LEADERBOARD_REFRESH_INTERVAL)
+                rows = list(
+                    scores.filter(updated_at__gte=refreshed_at - interval).values_list(
+                        "user_id", "score"
+                    )
+                )
+                with self.lock:
+                    for user_pk, score in rows:
+                        self.boards[board].set(str(user_pk), score)
+            self.generations[board] = generation
+            self.refreshed_at[board] = now
+            return self.boards[board]
+
+    def increment(self, board, user_pks, amount):
+        # A board not loaded yet gets the points from the table when it is.
+        sorted_set = self.boards.get(board)
+        if sorted_set is None:
+            return
+        with self.lock:
+            for user_pk in user_pks:
+                sorted_set.increment(str(user_pk), amount)
+
+    def remove(self, board, user_pk):
+        sorted_set = self.boards.get(board)
+        if sorted_set is None:
+            return
+        with self.lock:
+            sorted_set.discard(str(user_pk))
+
+    def get_top(self, board, count):
+        sorted_set = self.get_board(board)
+        with self.lock:
+            return sorted_set.range(0, count)
+
+    def get_rank(self, board, user_pk):
+        """Return the user's 0-based rank and score, or (None, None)."""
+        sorted_set = self.get_board(board)
+        with self.lock:
+            member = str(user_pk)
+            return sorted_set.rank(member), sorted_set.scores.get(member)
+
+
+class RedisLeaderboardStore:
+    """Boards held as Redis sorted sets, shared by every process."""
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get_key(self, board):
+        key = f"leaderboard:{board}"
+        if not self.client.exists(key):
+            # Loaded with absolute scores: racing loaders write the same values.
+            scores = LeaderboardScore.objects.filter(board=board).values_list(
+                "user_id", "score"
+            )
+            batch = {}
+            for user_pk, score in scores.iterator(chunk_size=10000):
+                batch[str(user_pk)] = score
+                if len(batch) == 10000:
+                    self.client.zadd(key, batch)
+                    batch = {}
+            if batch:
+                self.client.zadd(key, batch)
+        return key
+
+    def increment(self, board, user_pks, amount):
+        # A board not loaded yet gets the points from the table when it is.
+        key = f"leaderboard:{board}"
+        if not self.client.exists(key):
+            return
+        with self.client.pipeline(transaction=False) as pipeline:
+            for user_pk in user_pks:
+                pipeline.zincrby(key, amount, str(user_pk))
+            pipeline.execute()
+
+    def remove(self, board, user_pk):
+        self.client.zrem(f"leaderboard:{board}", str(user_pk))
+
+    def get_top(self, board, count):
+        items = self.client.zrevrange(self.get_key(board), 0, count - 1, True)
+        return [(member, int(score)) for member, score in items]
+
+    def get_rank(self, board, user_pk):
+        key = self.get_key(board)
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.zrevrank(key, str(user_pk))
+            pipeline.zscore(key, str(user_pk))
+            rank, score = pipeline.execute()
+        return rank, None if score is None else int(score)
+
+
+@lru_cache(maxsize=None)
+def get_leaderboard_store(url):
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryLeaderboardStore()
+    if parsed.scheme in ("redis", "rediss", "unix") and redis is not None:
+        return RedisLeaderboardStore(url)
+    raise ValueError(f"Unsupported LEADERBOARD_STORE_URL: {url}")
+
+
+def add_points(boards, user_pks):
+    """Give a point to each user on each board.
+
+    Must be called inside a transaction. The table is updated right away, the
+    store once the transaction commits.
+    """
+    user_pks = list(user_pks)
+    if not user_pks:
+        return
+
+    now = timezone.now()
+    for board in boards:
+        # Missing rows are created at 0 first, so that concurrent rounds
+        # never overwrite each other's points.
+        LeaderboardScore.objects.bulk_create(
+            [
+                LeaderboardScore(board=board, user_id=user_pk, score=0)
+                for user_pk in user_pks
+            ],
+            ignore_conflicts=True,
+        )
+        LeaderboardScore.objects.filter(board=board, user__in=user_pks).update(
+            score=F("score") + 1, updated_at=now
+        )
+
+    def increment_store():
+        store = get_leaderboard_store(settings.LEADERBOARD_STORE_URL)
+        for board in boards:
+            store.increment(board, user_pks, 1)
+
+    transaction.on_commit(increment_store)
+
+
+def remove_user(user_pk):
+    """Take a user off every board, in the table and in the store.
+
+    Must be called inside a transaction; the store is updated once it commits.
+    The boards' generations are bumped, so that the in-process boards of the
+    other processes are loaded again.
+    """
+    scores = LeaderboardScore.objects.filter(user=user_pk)
+    boards = list(scores.values_list("board", flat=True))
+    if not boards:
+        return
+    scores.delete()
+    Leaderboard.objects.bulk_create(
+        [Leaderboard(board=board) for board in boards], ignore_conflicts=True
+    )
+    Leaderboard.objects.filter(board__in=boards).update(generation=F("generation") + 1)
+
+    def remove_from_store():
+        store = get_leaderboard_store(settings.LEADERBOARD_STORE_URL)
+        for board in boards:
+            store.remove(board, user_pk)
+
+    transaction.on_commit(remove_from_store)
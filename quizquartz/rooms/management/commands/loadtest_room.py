@@ -0,0 +1,185 @@
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+from accounts.models import User
+from quizzes.models import Quiz
+from rooms.consumers import CLOSE_TOO_SLOW, websocket_application
+from rooms.models import Room
+from secrets import token_hex
+from time import perf_counter
+import asyncio
+import json
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class SimulatedClient:
+    """WebSocket client calling the ASGI application directly, in process."""
+
+    def __init__(self, token, code, slow=False):
+        self.scope = {
+            "type": "websocket",
+            "path": f"/ws/rooms/{code}/",
+            "query_string": f"token={token}".encode(),
+        }
+        self.incoming = asyncio.Queue()
+        self.received = asyncio.Queue()
+        self.slow = slow
+        self.close_code = None
+
+    def connect(self):
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(
+            websocket_application(self.scope, self.incoming.get, self.send)
+        )
+
+    async def send(self, event):
+        if event["type"] == "websocket.close":
+            self.close_code = event.get("code")
+        elif self.slow and event["type"] == "websocket.send":
+            # Never reads, like a client on a stalled network.
+            await asyncio.Event().wait()
+        self.received.put_nowait((perf_counter(), event))
+
+    def send_message(self, message):
+        self.incoming.put_nowait(
+            {"type": "websocket.receive", "text": json.dumps(message)}
+        )
+
+    def disconnect(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+    async def wait_for(self, kind):
+        """Return the arrival time and content of the next message of a type."""
+        while True:
+            received_at, event = await self.received.get()
+            if event["type"] == "websocket.accept" and kind == "accept":
+                return received_at, None
+            if event["type"] == "websocket.close":
+                raise CommandError(f"Connection closed with code {self.close_code}.")
+            if event["type"] == "websocket.send":
+                message = json.loads(event["text"])
+                if message["type"] == kind:
+                    return received_at, message
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test a room: run a host and many participants against the "
+        "WebSocket application in this process and report how long each "
+        "round takes to reach everyone. Uses throwaway users and a throwaway "
+        "room, deleted afterwards. --slow participants never read, to check "
+        "that they are dropped without delaying the others."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--participants", type=int, default=500)
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--slow", type=int, default=0)
+        parser.add_argument("--quiz", help="ID of the quiz to ask (the newest one).")
+
+    def handle(self, *args, **options):
+        quizzes = Quiz.objects.order_by("-created_at")
+        if options["quiz"]:
+            quizzes = quizzes.filter(pk=options["quiz"])
+        quiz = quizzes.first()
+        if quiz is None:
+            raise CommandError("No quiz to ask.")
+
+        prefix = f"loadtest-{token_hex(4)}-"
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}{i}",
+                    email=f"{prefix}{i}@loadtest.invalid",
+                    nickname=f"{prefix}{i}"[:30],
+                    password=password,
+                )
+                for i in range(options["participants"] + 1)
+            ]
+        )
+        try:
+            tokens = Token.objects.bulk_create(
+                [Token(key=Token.generate_key(), user=user) for user in users]
+            )
+            room = Room.objects.create(host=users[0])
+            asyncio.run(
+                self.run(
+                    room.code,
+                    quiz,
+                    [token.key for token in tokens],
+                    options["rounds"],
+                    options["slow"],
+                )
+            )
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
+
+    async def run(self, code, quiz, tokens, rounds, slow):
+        host = SimulatedClient(tokens[0], code)
+        participants = [
+            SimulatedClient(token, code, slow=i < slow)
+            for i, token in enumerate(tokens[1:])
+        ]
+        fast = [client for client in participants if not client.slow]
+        answers = quiz.answer if isinstance(quiz.answer, list) else [quiz.answer]
+
+        started = perf_counter()
+        for client in [host, *participants]:
+            client.connect()
+        await asyncio.gather(*(client.wait_for("accept") for client in [host, *fast]))
+        self.stdout.write(
+            f"connected: {len(participants)} participants ({slow} slow) "
+            f"in {(perf_counter() - started) * 1000:.0f} ms"
+        )
+
+        try:
+            for _ in range(rounds):
+                await self.run_round(host, fast, quiz, answers)
+        finally:
+            for client in [host, *participants]:
+                client.disconnect()
+            await asyncio.gather(
+                *(client.task for client in [host, *participants]),
+                return_exceptions=True,
+            )
+
+        dropped = sum(client.close_code == CLOSE_TOO_SLOW for client in participants)
+        self.stdout.write(f"slow participants dropped: {dropped} of {slow}")
+
+    async def run_round(self, host, fast, quiz, answers):
+        started = perf_counter()
+        host.send_message({"type": "start_round", "quiz": str(quiz.pk)})
+        arrivals = await asyncio.gather(*(client.wait_for("round") for client in fast))
+        latencies = [(received_at - started) * 1000 for received_at, _ in arrivals]
+        number = arrivals[0][1]["round"]
+
+        started = perf_counter()
+        for i, client in enumerate(fast):
+            answer = answers[0] if i % 2 else f"wrong {i}"
+            client.send_message({"type": "answer", "round": number, "answer": answer})
+        while True:
+            _, progress = await host.wait_for("progress")
+            if progress["round"] == number and progress["answers"] == len(fast):
+                break
+        collected = (perf_counter() - started) * 1000
+
+        started = perf_counter()
+        host.send_message({"type": "end_round"})
+        results = await asyncio.gather(
+            *(client.wait_for("round_result") for client in [host, *fast])
+        )
+        ended = (max(received_at for received_at, _ in results) - started) * 1000
+
+        self.stdout.write(
+            f"round {number}: question to all p50 {percentile(latencies, 0.5):.1f} ms, "
+            f"p99 {percentile(latencies, 0.99):.1f} ms, "
+            f"max {max(latencies):.1f} ms; answers collected {collected:.0f} ms "
+            f"(progress every ROOM_PROGRESS_INTERVAL); "
+            f"saved and results to all {ended:.1f} ms "
+            f"({results[0][1]['correct']}/{results[0][1]['answered']} correct)"
+        )
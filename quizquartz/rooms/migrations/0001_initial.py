@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:28
+
+import django.db.models.deletion
+import rooms.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('quizzes', '0009_quiz_moderation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Room',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('code', models.CharField(default=rooms.models.generate_room_code, editable=False, help_text='Code participants enter to join the room.', max_length=8, unique=True, verbose_name='Code')),
+                ('round_count', models.PositiveIntegerField(default=0, help_text='Number of rounds played so far.', verbose_name='Round Count')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Creation timestamp.', verbose_name='Created At')),
+                ('closed_at', models.DateTimeField(blank=True, help_text='Timestamp at which the host closed the room.', null=True, verbose_name='Closed At')),
+                ('host', models.ForeignKey(help_text='User who pushes the quizzes to the participants.', on_delete=django.db.models.deletion.CASCADE, related_name='hosted_rooms', to=settings.AUTH_USER_MODEL, verbose_name='Host')),
+            ],
+            options={
+                'verbose_name': 'Room',
+                'verbose_name_plural': 'Rooms',
+            },
+        ),
+        migrations.CreateModel(
+            name='RoomAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.PositiveIntegerField(help_text='Number of the round in the room, from 1.', verbose_name='Round')),
+                ('answer', models.JSONField(help_text='The answer given by the participant.', verbose_name='Answer')),
+                ('is_correct', models.BooleanField(help_text="Indicates whether the answer matches the quiz's answer.", verbose_name='Is Correct')),
+                ('answered_at', models.DateTimeField(help_text='Timestamp at which the answer was received.', verbose_name='Answered At')),
+                ('quiz', models.ForeignKey(help_text='The quiz asked in the round.', on_delete=django.db.models.deletion.CASCADE, related_name='room_answers', to='quizzes.quiz', verbose_name='Quiz')),
+                ('room', models.ForeignKey(help_text='The room the answer was given in.', on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='rooms.room', verbose_name='Room')),
+                ('user', models.ForeignKey(help_text='Participant who answered.', on_delete=django.db.models.deletion.CASCADE, related_name='room_answers', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Room Answer',
+                'verbose_name_plural': 'Room Answers',
+                'constraints': [models.UniqueConstraint(fields=('room', 'round', 'user'), name='roomanswer_round_user_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(help_text='"global", or "group:<quiz group ID>".', max_length=50, verbose_name='Board')),
+                ('score', models.PositiveIntegerField(default=0, help_text='Number of correct answers given in rooms.', verbose_name='Score')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Last update timestamp.', verbose_name='Updated At')),
+                ('user', models.ForeignKey(help_text='User who scored the points.', on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_scores', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Leaderboard Score',
+                'verbose_name_plural': 'Leaderboard Scores',
+                'indexes': [models.Index(fields=['board', 'updated_at'], name='leaderboard_updated_idx')],
+                'constraints': [models.UniqueConstraint(fields=('board', 'user'), name='leaderboard_board_user_uniq')],
+            },
+        ),
+    ]
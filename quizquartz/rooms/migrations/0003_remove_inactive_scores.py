@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations
+
+
+def remove_inactive_scores(apps, schema_editor):
+    # Deactivated users are now taken off the boards; drop the earlier ones.
+    LeaderboardScore = apps.get_model("rooms", "LeaderboardScore")
+    LeaderboardScore.objects.filter(user__is_active=False).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0002_leaderboard_scores'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_inactive_scores, migrations.RunPython.noop),
+    ]
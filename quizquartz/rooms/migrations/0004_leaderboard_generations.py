@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0003_remove_inactive_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(help_text='"global", or "group:<quiz group ID>".', max_length=50, unique=True, verbose_name='Board')),
+                ('generation', models.PositiveBigIntegerField(default=0, help_text='Bumped whenever scores are removed from the board.', verbose_name='Generation')),
+            ],
+            options={
+                'verbose_name': 'Leaderboard',
+                'verbose_name_plural': 'Leaderboards',
+            },
+        ),
+    ]
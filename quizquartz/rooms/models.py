@@ -0,0 +1,183 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from accounts.models import User
+from quizzes.models import Quiz
+from secrets import choice
+from uuid import uuid4
+
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+CODE_LENGTH = 8
+
+
+def generate_room_code():
+    return "".join(choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+
+
+class Room(models.Model):
+    """Model representing a live quiz session run by a host."""
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    code = models.CharField(
+        verbose_name=_("Code"),
+        max_length=CODE_LENGTH,
+        unique=True,
+        default=generate_room_code,
+        editable=False,
+        help_text=_("Code participants enter to join the room."),
+    )
+    host = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="hosted_rooms",
+        verbose_name=_("Host"),
+        help_text=_("User who pushes the quizzes to the participants."),
+    )
+    round_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Round Count"),
+        help_text=_("Number of rounds played so far."),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Created At"),
+        help_text=_("Creation timestamp."),
+    )
+    closed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Closed At"),
+        help_text=_("Timestamp at which the host closed the room."),
+    )
+
+    class Meta:
+        verbose_name = _("Room")
+        verbose_name_plural = _("Rooms")
+
+    def __str__(self):
+        return self.code
+
+
+class RoomAnswer(models.Model):
+    """Model representing a participant's answer in a round of a room."""
+
+    room = models.ForeignKey(
+        to=Room,
+        on_delete=models.CASCADE,
+        related_name="answers",
+        verbose_name=_("Room"),
+        help_text=_("The room the answer was given in."),
+    )
+    round = models.PositiveIntegerField(
+        verbose_name=_("Round"),
+        help_text=_("Number of the round in the room, from 1."),
+    )
+    quiz = models.ForeignKey(
+        to=Quiz,
+        on_delete=models.CASCADE,
+        related_name="room_answers",
+        verbose_name=_("Quiz"),
+        help_text=_("The quiz asked in the round."),
+    )
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="room_answers",
+        verbose_name=_("User"),
+        help_text=_("Participant who answered."),
+    )
+    answer = models.JSONField(
+        verbose_name=_("Answer"),
+        help_text=_("The answer given by the participant."),
+    )
+    is_correct = models.BooleanField(
+        verbose_name=_("Is Correct"),
+        help_text=_("Indicates whether the answer matches the quiz's answer."),
+    )
+    answered_at = models.DateTimeField(
+        verbose_name=_("Answered At"),
+        help_text=_("Timestamp at which the answer was received."),
+    )
+
+    class Meta:
+        verbose_name = _("Room Answer")
+        verbose_name_plural = _("Room Answers")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "round", "user"], name="roomanswer_round_user_uniq"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.room_id}:{self.round}:{self.user_id}"
+
+
+class LeaderboardScore(models.Model):
+    """Model storing a user's points on a leaderboard, the durable copy."""
+
+    board = models.CharField(
+        verbose_name=_("Board"),
+        max_length=50,
+        help_text=_('"global", or "group:<quiz group ID>".'),
+    )
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_scores",
+        verbose_name=_("User"),
+        help_text=_("User who scored the points."),
+    )
+    score = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Score"),
+        help_text=_("Number of correct answers given in rooms."),
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Updated At"),
+        help_text=_("Last update timestamp."),
+    )
+
+    class Meta:
+        verbose_name = _("Leaderboard Score")
+        verbose_name_plural = _("Leaderboard Scores")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "user"], name="leaderboard_board_user_uniq"
+            )
+        ]
+        # Serves the catch-up of the in-process boards.
+        indexes = [
+            models.Index(fields=["board", "updated_at"], name="leaderboard_updated_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.board}:{self.user_id}"
+
+
+class Leaderboard(models.Model):
+    """Model counting the removals from a leaderboard.
+
+    In-process boards are caught up with the rows updated since they were
+    last read, which misses deleted rows: a board whose generation changed is
+    loaded again instead.
+    """
+
+    board = models.CharField(
+        verbose_name=_("Board"),
+        max_length=50,
+        unique=True,
+        help_text=_('"global", or "group:<quiz group ID>".'),
+    )
+    generation = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_("Generation"),
+        help_text=_("Bumped whenever scores are removed from the board."),
+    )
+
+    class Meta:
+        verbose_name = _("Leaderboard")
+        verbose_name_plural = _("Leaderboards")
+
+    def __str__(self):
+        return f"{self.board}:{self.generation}"
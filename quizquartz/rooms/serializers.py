@@ -0,0 +1,10 @@
+from rest_framework import serializers
+from .models import Room
+
+
+class RoomSerializer(serializers.ModelSerializer):
+    """Serializer for rooms."""
+
+    class Meta:
+        model = Room
+        fields = ("id", "code", "round_count", "created_at", "closed_at")
@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .leaderboards import remove_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def remove_inactive_user(sender, instance, **kwargs):
+    """Take deactivated users off the leaderboards, so ranks have no gaps."""
+    if not instance.is_active:
+        with transaction.atomic():
+            remove_user(instance.pk)
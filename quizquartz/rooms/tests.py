@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .leaderboards import (
+    GLOBAL_BOARD,
+    MemoryLeaderboardStore,
+    SortedSet,
+    remove_user,
+)
+from .models import LeaderboardScore
+from datetime import timedelta
+import random
+
+
+class SortedSetTests(TestCase):
+    """The skip list ranks like a sorted list of (-score, member)."""
+
+    def test_matches_sorted_list(self):
+        rng = random.Random(0)
+        sorted_set = SortedSet.from_scores(
+            (f"m{i}", rng.randrange(20)) for i in range(50)
+        )
+        for _ in range(500):
+            member = f"m{rng.randrange(80)}"
+            if rng.random() < 0.2:
+                sorted_set.discard(member)
+            else:
+                sorted_set.increment(member, rng.randrange(1, 5))
+
+        expected = sorted(
+            sorted_set.scores.items(), key=lambda item: (-item[1], item[0])
+        )
+        self.assertEqual(sorted_set.range(0, len(expected)), expected)
+        self.assertEqual(sorted_set.range(10, 15), expected[10:15])
+        for rank, (member, _) in enumerate(expected):
+            self.assertEqual(sorted_set.rank(member), rank)
+        self.assertIsNone(sorted_set.rank("missing"))
+
+
+@override_settings(LEADERBOARD_REFRESH_INTERVAL=0)
+class MemoryLeaderboardStoreTests(TestCase):
+    """In-process boards catch up with the rows other processes changed."""
+
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="x",
+                nickname=f"user{i}",
+            )
+            for i in range(3)
+        ]
+        for user, score in zip(self.users[:2], [5, 3]):
+            LeaderboardScore.objects.create(board=GLOBAL_BOARD, user=user, score=score)
+        self.store = MemoryLeaderboardStore()
+
+    def test_catch_up(self):
+        self.assertEqual(
+            self.store.get_top(GLOBAL_BOARD, 10),
+            [(str(self.users[0].pk), 5), (str(self.users[1].pk), 3)],
+        )
+        LeaderboardScore.objects.filter(user=self.users[1]).update(
+            score=7, updated_at=timezone.now()
+        )
+
+        self.assertEqual(
+            self.store.get_top(GLOBAL_BOARD, 10),
+            [(str(self.users[1].pk), 7), (str(self.users[0].pk), 5)],
+        )
+
+    def test_removal_and_insertion(self):
+        self.store.get_top(GLOBAL_BOARD, 10)
+        # Another process removes a scorer while a new one scores, in a
+        # transaction that commits after the catch-up window: the table keeps
+        # the size of the board.
+        with transaction.atomic():
+            remove_user(self.users[0].pk)
+        LeaderboardScore.objects.create(
+            board=GLOBAL_BOARD,
+            user=self.users[2],
+            score=1,
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(
+            self.store.get_top(GLOBAL_BOARD, 10),
+            [(str(self.users[1].pk), 3), (str(self.users[2].pk), 1)],
+        )
+        self.assertEqual(
+            self.store.get_rank(GLOBAL_BOARD, self.users[0].pk), (None, None)
+        )
@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import RoomCreateAPIView, LeaderboardAPIView, GroupLeaderboardAPIView
+
+urlpatterns = [
+    # Any user can access.
+    path(route="leaderboard/", view=LeaderboardAPIView.as_view()),
+    path(
+        route="leaderboard/quizgroup/<uuid:pk>/",
+        view=GroupLeaderboardAPIView.as_view(),
+    ),
+    # Authenticated users only can access.
+    path(route="room/create/", view=RoomCreateAPIView.as_view()),
+]
@@ -0,0 +1,102 @@
+from django.conf import settings
+from rest_framework import generics, status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import get_object_or_404
+from accounts.models import User
+from quizzes.models import QuizGroup
+from .leaderboards import GLOBAL_BOARD, get_group_board, get_leaderboard_store
+from .models import Room
+from .serializers import RoomSerializer
+
+
+class RoomCreateAPIView(generics.CreateAPIView):
+    """Room create view.
+
+    The room is then run over the WebSocket endpoint (see ``rooms.consumers``)
+    with the returned code.
+    """
+
+    queryset = Room.objects.all()
+    serializer_class = RoomSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "write"
+
+    def post(self, request, *args, **kwargs):
+        room = Room.objects.create(host=request.user)
+        return Response(
+            data={
+                "message": "ルームの作成に成功しました。",
+                "room": RoomSerializer(room).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class LeaderboardAPIView(APIView):
+    """Global leaderboard view.
+
+    Returns the top ``?limit=`` scorers (``LEADERBOARD_SIZE`` by default,
+    ``LEADERBOARD_MAX_SIZE`` at most) and, for an authenticated user, their
+    own rank. Both are read from the leaderboard store, not the table.
+    """
+
+    def get_board(self):
+        return GLOBAL_BOARD
+
+    def get_limit(self):
+        try:
+            limit = int(
+                self.request.query_params.get("limit", settings.LEADERBOARD_SIZE)
+            )
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.LEADERBOARD_MAX_SIZE:
+            raise ParseError(
+                detail={
+                    "error": f"limitには1から{settings.LEADERBOARD_MAX_SIZE}までの数を指定してください。"
+                }
+            )
+        return limit
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_board()
+        store = get_leaderboard_store(settings.LEADERBOARD_STORE_URL)
+        top = store.get_top(board, self.get_limit())
+
+        # Deactivated users are taken off the boards (see rooms.signals); any
+        # a process has not caught up with yet are left out here.
+        nicknames = dict(
+            User.objects.filter(
+                pk__in=[user_pk for user_pk, _ in top], is_active=True
+            ).values_list("pk", "nickname")
+        )
+        nicknames = {str(pk): nickname for pk, nickname in nicknames.items()}
+        # Ranked after filtering, so that the ranks have no gaps.
+        top = [(user_pk, score) for user_pk, score in top if user_pk in nicknames]
+        data = {
+            "results": [
+                {"rank": rank, "nickname": nicknames[user_pk], "score": score}
+                for rank, (user_pk, score) in enumerate(top, 1)
+            ],
+            "me": None,
+        }
+
+        if request.user.is_authenticated:
+            rank, score = store.get_rank(board, request.user.pk)
+            if rank is not None:
+                data["me"] = {"rank": rank + 1, "score": score}
+
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
+class GroupLeaderboardAPIView(LeaderboardAPIView):
+    """Quiz group leaderboard view, for the quizzes of one group."""
+
+    def get_board(self):
+        quiz_group = get_object_or_404(
+            QuizGroup.objects.only("pk"), pk=self.kwargs["pk"]
+        )
+        return get_group_board(quiz_group.pk)